@@ -41,5 +41,6 @@ setuptools.setup(
     python_requires='>=3.5',
     extras_require={
         'dev': ['check-manifest'],
+        'numpy': ['numpy'],
     },
 )
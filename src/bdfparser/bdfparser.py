@@ -5,9 +5,32 @@
 
 import re
 import io
+import os
+import sys
+import json
+import bisect
+import codecs
+import copy
+import mmap
+import struct
+import hashlib
 import pathlib
+import tempfile
+import threading
 import warnings
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from sys import version_info as python_version
+from ._unicodeblocks import UNICODE_BLOCKS as _UNICODE_BLOCKS
+
+_np = None  # NumPy, imported on first use by `ArrayBitmap`
+
+if python_version < (3, 7, 0):
+    from collections import OrderedDict as _ordered_dict
+else:
+    _ordered_dict = dict
 
 
 def format_warning(message, category, filename, lineno, file=None, line=None):
@@ -17,6 +40,768 @@ def format_warning(message, category, filename, lineno, file=None, line=None):
 warnings.formatwarning = format_warning
 
 
+_PATTERN_FIRST_STARTCHAR = re.compile(rb'^[ \t]*STARTCHAR[ \t]+\S[^\n]*', re.M)
+
+_PATTERN_NEXT_GLYPH = re.compile(
+    rb'^[ \t]*(?:STARTCHAR[ \t]+\S|(ENDFONT)[ \t\r]*$)', re.M)
+
+# keyword-first patterns, so that `re` can skip bitmap rows with a fast literal search
+_PATTERN_ENDCHAR = re.compile(rb'ENDCHAR[ \t\r]*(?:\n|\Z)')
+_PATTERN_BITMAP = re.compile(rb'BITMAP[ \t\r]*$', re.M)
+
+_PATTERN_ENCODING = re.compile(rb'^[ \t]*ENCODING[ \t]+(\S[^\r\n]*)', re.M)
+
+_PATTERN_GLYPH_KEYWORD = re.compile(
+    rb'^[ \t]*(STARTCHAR|ENCODING|BBX|SWIDTH|DWIDTH|SWIDTH1|DWIDTH1|VVECTOR)[ \t]+(\S[^\r\n]*)', re.M)
+
+# A glyph's lines up to `BITMAP` in the usual layout, matched in one go;
+# glyphs in any other layout go through `_GlyphScan.step()`
+_PATTERN_GLYPH = re.compile(rb'''
+    STARTCHAR[ \t]+(\S[^\r\n]*)\r?\n
+    ENCODING[ \t]+(-?\d+)[ \t\r]*\n
+    (?:SWIDTH[ \t]+(-?\d+)[ \t]+(-?\d+)[ \t\r]*\n)?
+    (?:DWIDTH[ \t]+(-?\d+)[ \t]+(-?\d+)[ \t\r]*\n)?
+    (?:SWIDTH1[ \t]+(-?\d+)[ \t]+(-?\d+)[ \t\r]*\n)?
+    (?:DWIDTH1[ \t]+(-?\d+)[ \t]+(-?\d+)[ \t\r]*\n)?
+    (?:VVECTOR[ \t]+(-?\d+)[,\s]+(-?\d+)[ \t\r]*\n)?
+    BBX[ \t]+(-?\d+)[ \t]+(-?\d+)[ \t]+(-?\d+)[ \t]+(-?\d+)[ \t\r]*\n
+    BITMAP[ \t\r]*\n
+''', re.X)
+
+_PATTERN_VVECTOR_DELIMITER_BYTES = re.compile(rb'[,\s]+')
+
+# glyph keyword -> index of its first value in a glyph meta list
+_GLYPH_KEYWORDS = {
+    b'SWIDTH': 6,
+    b'DWIDTH': 8,
+    b'SWIDTH1': 10,
+    b'DWIDTH1': 12,
+    b'VVECTOR': 14,
+}
+
+
+def _codepoint_filter(r):
+    # Predicate for the `r` forms taken by `Font.itercps()`:
+    # an `int` (codepoints below it), a `tuple` range or a `list` of `tuple` ranges
+    if isinstance(r, int):
+        return lambda cp: cp < r
+    elif isinstance(r, tuple):
+        return lambda cp: cp <= r[1] and cp >= r[0]
+    elif isinstance(r, list):
+        return lambda cp: any(cp <= t[1] and cp >= t[0] for t in r)
+    return lambda cp: False
+
+
+def _open_file(file_path, binary=False):
+    # Open the BDF file, decompressing it on the fly if its magic bytes are
+    # those of a gzip, bzip2 or xz file
+    with open(file_path, 'rb') as f:
+        magic = f.read(6)
+    if magic.startswith(b'\x1f\x8b'):
+        import gzip
+        opener = gzip.open
+    elif magic.startswith(b'BZh'):
+        import bz2
+        opener = bz2.open
+    elif magic.startswith(b'\xfd7zXZ\x00'):
+        import lzma
+        opener = lzma.open
+    else:
+        return open(file_path, 'rb' if binary else 'r')
+    return opener(file_path, 'rb' if binary else 'rt')
+
+
+def _missing_pattern(cps):
+    # Pattern matching the characters not in sorted `cps`: a negated class of
+    # the codepoint runs, which `re` compiles to a bitmap
+    ranges = []
+    for cp in cps:
+        if cp is None or cp < 0 or cp > 0x10FFFF:
+            continue
+        if ranges and ranges[-1][1] == cp - 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    if not ranges:
+        return re.compile('(?s).')
+    return re.compile('[^' + ''.join(re.escape(chr(a)) if a == b else re.escape(chr(a)) + '-' + re.escape(chr(b)) for a, b in ranges) + ']')
+
+
+_UNICODE_BLOCK_STARTS = [block[0] for block in _UNICODE_BLOCKS]
+
+
+def _unicode_block(cp):
+    i = bisect.bisect_right(_UNICODE_BLOCK_STARTS, cp) - 1
+    if i >= 0 and cp <= _UNICODE_BLOCKS[i][1]:
+        return _UNICODE_BLOCKS[i][2]
+    return 'No_Block'
+
+
+def _file_buffer(file_obj):
+    # Memory-map binary files when possible, otherwise read the whole content
+    # (decompressing file objects have the `fileno()` of the compressed file)
+    if isinstance(file_obj, (io.FileIO, io.BufferedReader, io.BufferedRandom)):
+        try:
+            if file_obj.tell() == 0:
+                return mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            pass
+    data = file_obj.read()
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return data
+
+
+def _search_line(pattern, buf, pos, endpos):
+    # Search a keyword-first pattern, only accepting matches at the start of a line
+    while 1:
+        m = pattern.search(buf, pos, endpos)
+        if m is None:
+            return None
+        i = m.start()
+        while i > 0 and buf[i - 1] in (32, 9):  # spaces and tabs
+            i -= 1
+        if i == 0 or buf[i - 1] == 10:  # '\n'
+            return m
+        pos = m.end()
+
+
+class _GlyphScan(object):
+    '''
+    One fast pass over the glyph section of a BDF buffer, yielding the `(codepoint, start, bitmap_start, bitmap_end)` offsets of every `STARTCHAR`...`ENDCHAR` block, without parsing the glyphs.
+
+    `bitmap_start` is `None` if the glyph does not have a `BITMAP` line. With `only` (see `Font.load_file_path()`), the other glyphs are skipped and counted in `skipped`.
+    '''
+
+    def __init__(self, buf, pos=0, only=None):
+        self.buf = buf
+        self.pos = pos
+        self.endfont = False
+        self.wanted = None if only is None else _codepoint_filter(only)
+        self.skipped = 0
+
+    def step(self, pos):
+        '''
+        Find the glyph after `pos`, the slow way. Returns `(start, bitmap_start, bitmap_end, end)`, or `None` at `ENDFONT` or at the end of the buffer.
+        '''
+
+        buf = self.buf
+        while 1:
+            m = _PATTERN_NEXT_GLYPH.search(buf, pos)
+            if m is None:
+                return None
+            if m.group(1) is None:
+                break
+            if pos != self.pos:  # ENDFONT after a glyph
+                self.endfont = True
+                return None
+            pos = m.end()
+        start = m.start()
+        m = _search_line(_PATTERN_ENDCHAR, buf, start, len(buf))
+        if m is None:
+            return None
+        end = m.end()
+        bitmap_end = m.start()
+        m = _search_line(_PATTERN_BITMAP, buf, start, bitmap_end)
+        return start, None if m is None else m.end(), bitmap_end, end
+
+    def __iter__(self):
+        buf = self.buf
+        pos = self.pos
+        match = _PATTERN_GLYPH.match
+        endpos = len(buf)
+        while 1:
+            m = match(buf, pos)
+            if m is not None:
+                e = _search_line(_PATTERN_ENDCHAR, buf, m.end(), endpos)
+                if e is not None:
+                    pos = e.end()
+                    codepoint = int(m.group(2))
+                    if self.wants(codepoint):
+                        yield codepoint, m.start(), m.end(), e.start()
+                    continue
+            span = self.step(pos)
+            if span is None:
+                return
+            start, bitmap_start, bitmap_end, pos = span
+            codepoint = _glyph_codepoint(buf, start, bitmap_start, bitmap_end)
+            if self.wants(codepoint):
+                yield codepoint, start, bitmap_start, bitmap_end
+
+    def wants(self, codepoint):
+        if self.wanted is None:
+            return True
+        if codepoint is not None and self.wanted(codepoint):
+            return True
+        self.skipped += 1
+        return False
+
+
+class _GlyphReader(_GlyphScan):
+    '''
+    Parse the glyph section of a BDF buffer, yielding a glyph meta list for every `STARTCHAR`...`ENDCHAR` block.
+    '''
+
+    def __iter__(self):
+        buf = self.buf
+        pos = self.pos
+        match = _PATTERN_GLYPH.match
+        endpos = len(buf)
+        while 1:
+            m = match(buf, pos)
+            if m is not None:
+                e = _search_line(_PATTERN_ENDCHAR, buf, m.end(), endpos)
+                if e is not None and not self.wants(int(m.group(2))):
+                    pos = e.end()
+                    continue
+                if e is not None:
+                    g = m.groups()
+                    n = [None if v is None else int(v) for v in g[1:]]
+                    yield [g[0].strip().decode('utf-8', 'replace'), n[0], n[11], n[12], n[13], n[14],
+                           n[1], n[2], n[3], n[4], n[5], n[6], n[7], n[8], n[9], n[10],
+                           _bitmap_rows(buf, m.end(), e.start())]
+                    pos = e.end()
+                    continue
+            span = self.step(pos)
+            if span is None:
+                return
+            pos = span[3]
+            if self.wants(_glyph_codepoint(buf, *span[:3])):
+                yield _parse_glyph(buf, *span[:3])
+
+
+def _bitmap_rows(buf, start, end):
+    # Rows of a `BITMAP` block: its lines of exactly one token, as in the
+    # text parser
+    text = bytes(buf[start:end]).decode('latin-1')
+    if ' ' not in text and '\t' not in text:
+        return text.split()
+    return [tokens[0] for tokens in (line.split() for line in text.split('\n')) if len(tokens) == 1]
+
+
+def _glyph_codepoint(buf, start, bitmap_start, bitmap_end):
+    # Read only the `ENCODING` of a glyph found by `_GlyphScan`
+    m = _PATTERN_ENCODING.search(
+        buf, start, bitmap_end if bitmap_start is None else bitmap_start)
+    return None if m is None else int(m.group(1).split()[0])
+
+
+def _parse_glyph(buf, start, bitmap_start, bitmap_end):
+    # Parse a glyph found by `_GlyphScan` into a glyph meta list
+    glyph_meta = [None] * 17
+    used = set()
+    for m in _PATTERN_GLYPH_KEYWORD.finditer(buf, start, bitmap_end if bitmap_start is None else bitmap_start):
+        key = m.group(1)
+        if key in used:
+            continue
+        used.add(key)
+        value = m.group(2)
+        if key == b'STARTCHAR':
+            glyph_meta[0] = value.strip().decode('utf-8', 'replace')
+        elif key == b'ENCODING':
+            glyph_meta[1] = int(value.split()[0])
+        elif key == b'BBX':
+            nlist = value.split()
+            glyph_meta[2] = int(nlist[0])
+            glyph_meta[3] = int(nlist[1])
+            glyph_meta[4] = int(nlist[2])
+            glyph_meta[5] = int(nlist[3])
+        else:
+            i = _GLYPH_KEYWORDS[key]
+            if i == 14:
+                nlist = _PATTERN_VVECTOR_DELIMITER_BYTES.split(value.strip())
+            else:
+                nlist = value.split()
+            glyph_meta[i] = int(nlist[0])
+            glyph_meta[i + 1] = int(nlist[1])
+    if bitmap_start is None:
+        glyph_meta[16] = []
+    else:
+        glyph_meta[16] = _bitmap_rows(buf, bitmap_start, bitmap_end)
+    return glyph_meta
+
+
+def _split_glyph_section(buf, pos, n):
+    # Offsets splitting the glyph section into (up to) `n` chunks at `STARTCHAR` lines
+    endpos = len(buf)
+    size = (endpos - pos) // n
+    bounds = [pos]
+    for i in range(1, n):
+        m = _PATTERN_FIRST_STARTCHAR.search(
+            buf, max(bounds[-1] + 1, pos + i * size))
+        if m is None:
+            break
+        bounds.append(m.start())
+    bounds.append(endpos)
+    return bounds
+
+
+def _parse_glyph_chunk(chunk, only=None):
+    # Run in worker processes by `Font(..., workers=N)`; the glyphs, in file
+    # order, are sent back as `_PackedGlyphs` sections
+    scan = _GlyphReader(chunk, only=only)
+    packed = _PackedGlyphs.pack(
+        (glyph_meta[1], glyph_meta) for glyph_meta in scan)
+    return packed.sections, scan.endfont, scan.skipped
+
+
+def _unpack_glyph_chunk(sections):
+    # -> the glyph meta lists of `_parse_glyph_chunk()`'s sections, repeated
+    # codepoints included
+    packed = _PackedGlyphs(*sections)
+    return (packed._load(i) for i in range(len(sections[0])))
+
+
+class _GlyphDict(_ordered_dict):
+    '''
+    Codepoint -> glyph meta list `dict` of `Font.glyphs`, whose `version` changes each time it is modified.
+    '''
+
+    version = 0  # also while unpickling, which sets items before `__dict__`
+
+    def __init__(self, *args, **kwargs):
+        self.version = 0
+        _ordered_dict.__init__(self, *args, **kwargs)
+
+    def __setitem__(self, codepoint, glyph_meta):
+        _ordered_dict.__setitem__(self, codepoint, glyph_meta)
+        self.version += 1
+
+    def __delitem__(self, codepoint):
+        _ordered_dict.__delitem__(self, codepoint)
+        self.version += 1
+
+    def pop(self, *args):
+        self.version += 1
+        return _ordered_dict.pop(self, *args)
+
+    def popitem(self, *args):
+        self.version += 1
+        return _ordered_dict.popitem(self, *args)
+
+    def setdefault(self, *args):
+        self.version += 1
+        return _ordered_dict.setdefault(self, *args)
+
+    def update(self, *args, **kwargs):
+        self.version += 1
+        _ordered_dict.update(self, *args, **kwargs)
+
+    def clear(self):
+        self.version += 1
+        _ordered_dict.clear(self)
+
+
+class _GlyphMapping(MutableMapping):
+    '''
+    Base of the codepoint -> glyph meta list mappings which build glyph meta lists on demand.
+
+    `_index` maps each codepoint to what `_load()`, defined by the subclasses using this `__getitem__()`, needs to build its glyph meta list; built lists are kept in `_cache` if `keep` is true. Assigned glyph meta lists are always kept.
+    '''
+
+    def __init__(self, index, keep=True):
+        self._index = index
+        self._cache = {}
+        self.keep = keep
+        self.version = 0
+
+    def __getitem__(self, codepoint):
+        glyph_meta = self._cache.get(codepoint)
+        if glyph_meta is None:
+            glyph_meta = self._load(self._index[codepoint])
+            if self.keep:
+                self._cache[codepoint] = glyph_meta
+        return glyph_meta
+
+    def __setitem__(self, codepoint, glyph_meta):
+        if codepoint not in self._index:
+            self._index[codepoint] = None
+        self._cache[codepoint] = glyph_meta
+        self.version += 1
+
+    def __delitem__(self, codepoint):
+        del self._index[codepoint]
+        self._cache.pop(codepoint, None)
+        self.version += 1
+
+    def __contains__(self, codepoint):
+        return codepoint in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def keys(self):
+        return self._index.keys()
+
+    def parsed(self):
+        '''
+        Number of glyph meta lists built so far.
+        '''
+
+        return len(self._cache)
+
+    def names(self):
+        '''
+        `(glyph name, codepoint)` pairs of the glyphs.
+        '''
+
+        for codepoint in self._index:
+            yield self[codepoint][0], codepoint
+
+
+class _LazyGlyphs(_GlyphMapping):
+    '''
+    Glyph mapping which parses each glyph from the font buffer the first time it is looked up.
+    '''
+
+    def __init__(self, buf, spans, prefetch=None):
+        _GlyphMapping.__init__(self, spans)
+        self.__buf = buf
+        if prefetch is True:
+            prefetch = 256
+        self.__prefetch = prefetch
+        self.__prefetched_pages = set()
+        self.__executor = None
+        self.__pending = 0  # pages scheduled and not prefetched yet
+        self.__lock = threading.Lock()  # prefetching vs. changing the glyphs
+
+    def _load(self, span):
+        return _parse_glyph(self.__buf, *span)
+
+    def __setitem__(self, codepoint, glyph_meta):
+        with self.__lock:
+            _GlyphMapping.__setitem__(self, codepoint, glyph_meta)
+
+    def __delitem__(self, codepoint):
+        with self.__lock:
+            _GlyphMapping.__delitem__(self, codepoint)
+
+    def __getitem__(self, codepoint):
+        if self.__prefetch and codepoint not in self._cache:
+            self.__schedule_prefetch(codepoint)
+        return _GlyphMapping.__getitem__(self, codepoint)
+
+    def names(self):
+        buf = self.__buf
+        for codepoint, span in self._index.items():
+            glyph_meta = self._cache.get(codepoint)
+            if glyph_meta is not None or span is None:
+                yield self[codepoint][0], codepoint
+            else:
+                # the `STARTCHAR` line, without parsing the glyph
+                m = _PATTERN_GLYPH_KEYWORD.match(buf, span[0])
+                yield m.group(2).strip().decode('utf-8', 'replace'), codepoint
+
+    def __schedule_prefetch(self, codepoint):
+        page = codepoint // self.__prefetch
+        if page in self.__prefetched_pages:
+            return
+        self.__prefetched_pages.add(page)
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=1)
+            self.__pending += 1
+            self.__executor.submit(self.__prefetch_page, page)
+
+    def __prefetch_page(self, page):
+        spans = self._index
+        cache = self._cache
+        try:
+            for codepoint in range(page * self.__prefetch, (page + 1) * self.__prefetch):
+                span = spans.get(codepoint)
+                if span is None or codepoint in cache:
+                    continue
+                glyph_meta = _parse_glyph(self.__buf, *span)
+                with self.__lock:
+                    # skipped if the glyph was changed or deleted meanwhile
+                    if spans.get(codepoint) is span and codepoint not in cache:
+                        cache[codepoint] = glyph_meta
+        finally:
+            with self.__lock:
+                self.__pending -= 1
+                if self.__pending == 0:
+                    # the thread ends once idle, a new one is started for
+                    # the next page
+                    self.__executor.shutdown(wait=False)
+                    self.__executor = None
+
+
+class _StackedGlyphs(_GlyphMapping):
+    '''
+    Glyph mapping of a `FontStack`: each codepoint maps to the first font having it, whose glyph meta list is looked up without copying.
+
+    A glyph without `DWIDTH` (or `DWIDTH1`) gets a copy of its glyph meta list with the font's global value, which the stack cannot hold for each font.
+    '''
+
+    def __init__(self, fonts):
+        index = _ordered_dict()
+        for font in fonts:
+            for cp in font.glyphs:
+                if cp not in index:
+                    index[cp] = font
+        _GlyphMapping.__init__(self, index, keep=False)
+
+    def __getitem__(self, codepoint):
+        glyph_meta = self._cache.get(codepoint)
+        if glyph_meta is not None:
+            return glyph_meta
+        font = self._index[codepoint]
+        glyph_meta = font.glyphs[codepoint]
+        fh = font.headers
+        for i, keys in ((8, ('dwx0', 'dwy0')), (12, ('dwx1', 'dwy1'))):
+            if glyph_meta[i] is None and glyph_meta[i + 1] is None and (keys[0] in fh or keys[1] in fh):
+                glyph_meta = list(glyph_meta)
+                glyph_meta[i] = fh.get(keys[0])
+                glyph_meta[i + 1] = fh.get(keys[1])
+        return glyph_meta
+
+    def font(self, codepoint):
+        return self._index[codepoint]
+
+
+# Packed glyph layout, shared by compiled font files
+_ABSENT = -0x80000000  # int32 sentinel for `None` metrics
+_PACKED_FIELDS = 18  # glyph meta items 1-15, then bitmap row count, row length (hex digits) and kind
+_BITMAP_UPPER = 0  # packed bytes, uppercase hex rows
+_BITMAP_LOWER = 1  # packed bytes, lowercase hex rows
+_BITMAP_TEXT = 2  # rows kept as text, joined by '\n'
+
+
+def _pack_hexdata(hexdata):
+    # -> (row length, kind, bytes)
+    if not hexdata:
+        return 0, _BITMAP_UPPER, b''
+    w = len(hexdata[0])
+    joined = ''.join(hexdata)
+    if w % 2 == 0 and all(len(h) == w for h in hexdata):
+        if joined == joined.upper():
+            kind = _BITMAP_UPPER
+        elif joined == joined.lower():
+            kind = _BITMAP_LOWER
+        else:
+            kind = None
+        if kind is not None:
+            try:
+                return w, kind, bytes.fromhex(joined)
+            except ValueError:
+                pass
+    return 0, _BITMAP_TEXT, '\n'.join(hexdata).encode('utf-8')
+
+
+def _unpack_hexdata(rows, w, kind, data):
+    if rows == 0:
+        return []
+    if kind == _BITMAP_TEXT:
+        return data.decode('utf-8').split('\n')
+    h = data.hex()
+    if kind == _BITMAP_UPPER:
+        h = h.upper()
+    return [h[i:i + w] for i in range(0, rows * w, w)]
+
+
+class _PackedGlyphs(_GlyphMapping):
+    '''
+    Glyph mapping backed by packed arrays (`array.array`s, or `memoryview`s of a compiled font file):
+
+    * `codepoints`: int32, the mapping's keys, in order
+    * `fields`: int32, `_PACKED_FIELDS` items per glyph
+    * `name_offsets` / `names`: uint32 offsets (one more than the glyph count) into UTF-8 glyph names
+    * `bitmap_offsets` / `bitmaps`: uint32 offsets into packed bitmaps
+
+    It is also the compact glyph store of `Font(..., compact=True)`, which does not keep built glyph meta lists.
+    '''
+
+    def __init__(self, codepoints, fields, name_offsets, names, bitmap_offsets, bitmaps, owner=None, keep=True):
+        _GlyphMapping.__init__(self, _ordered_dict(
+            (None if cp == _ABSENT else cp, i) for i, cp in enumerate(codepoints)), keep)
+        self.sections = (codepoints, fields, name_offsets,
+                         names, bitmap_offsets, bitmaps)
+        self.owner = owner  # keeps the underlying buffer (e.g. `mmap`) alive
+
+    def _load(self, i):
+        (_, fields, name_offsets, names, bitmap_offsets, bitmaps) = self.sections
+        f = fields[i * _PACKED_FIELDS:(i + 1) * _PACKED_FIELDS]
+        name = bytes(names[name_offsets[i]:name_offsets[i + 1]]).decode('utf-8')
+        glyph_meta = [None if name == '\0' else name]
+        glyph_meta.extend(None if v == _ABSENT else v for v in f[:15])
+        glyph_meta.append(_unpack_hexdata(f[15], f[16], f[17], bytes(
+            bitmaps[bitmap_offsets[i]:bitmap_offsets[i + 1]])))
+        return glyph_meta
+
+    def names(self):
+        (_, _, name_offsets, names, _, _) = self.sections
+        for codepoint, i in self._index.items():
+            glyph_meta = self._cache.get(codepoint)
+            if glyph_meta is not None or i is None:
+                yield self[codepoint][0], codepoint
+            else:
+                name = bytes(names[name_offsets[i]:name_offsets[i + 1]]).decode('utf-8')
+                yield None if name == '\0' else name, codepoint
+
+    def replaced(self):
+        '''
+        Glyph meta lists packed before a later glyph of the same codepoint.
+        '''
+
+        for i, cp in enumerate(self.sections[0]):
+            if self._index.get(None if cp == _ABSENT else cp) != i:
+                yield self._load(i)
+
+    @classmethod
+    def pack(cls, items, keep=True):
+        '''
+        Pack the `(codepoint, glyph meta list)` pairs of a mapping's `.items()`, or of any iterable (a repeated codepoint replaces the earlier glyph, as in a `dict`).
+        '''
+
+        codepoints = array('i')
+        fields = array('i')
+        name_offsets = array('I', [0])
+        names = bytearray()
+        bitmap_offsets = array('I', [0])
+        bitmaps = bytearray()
+        for cp, glyph_meta in items:
+            codepoints.append(_ABSENT if cp is None else cp)
+            fields.extend(_ABSENT if v is None else v for v in glyph_meta[1:16])
+            hexdata = glyph_meta[16] or []
+            w, kind, data = _pack_hexdata(hexdata)
+            fields.extend((len(hexdata), w, kind))
+            name = glyph_meta[0]
+            names += ('\0' if name is None else name).encode('utf-8')
+            name_offsets.append(len(names))
+            bitmaps += data
+            bitmap_offsets.append(len(bitmaps))
+        return cls(codepoints, fields, name_offsets, bytes(names), bitmap_offsets, bytes(bitmaps), keep=keep)
+
+
+# Compiled font file: header, JSON headers and properties, then the `_PackedGlyphs` sections, each 8-byte aligned
+_COMPILED_MAGIC = b'BDFC'
+_COMPILED_VERSION = 1
+# magic, version, reserved, source size, source mtime (ns), source SHA-1, glyph count, JSON size, names size, bitmaps size
+_COMPILED_HEADER = struct.Struct('<4sHHqq20sIIII')
+_COMPILED_MTIME_OFFSET = struct.calcsize('<4sHHq')
+
+
+class _BitmapInterner(object):
+    # Content-addressed store of bitmap rows and glyph bitmaps (`hexdata`)
+
+    def __init__(self):
+        self.rows = {}
+        self.bitmaps = {}
+        self.row_count = 0
+        self.bitmap_count = 0
+        self.savedbytes = 0
+
+    def hexdata(self, hexdata):
+        self.bitmap_count += 1
+        self.row_count += len(hexdata)
+        key = tuple(hexdata)
+        shared = self.bitmaps.get(key)
+        if shared is not None:
+            self.savedbytes += sys.getsizeof(hexdata) + \
+                sum(sys.getsizeof(row) for row in hexdata)
+            return shared
+        rows = self.rows
+        for i, row in enumerate(hexdata):
+            shared_row = rows.setdefault(row, row)
+            if shared_row is not row:
+                self.savedbytes += sys.getsizeof(row)
+                hexdata[i] = shared_row
+        self.bitmaps[tuple(hexdata)] = hexdata
+        return hexdata
+
+    def glyphs(self, glyph_metas):
+        for glyph_meta in glyph_metas:
+            glyph_meta[16] = self.hexdata(glyph_meta[16])
+            yield glyph_meta
+
+    def stats(self):
+        return {'rows': self.row_count,
+                'unique_rows': len(self.rows),
+                'bitmaps': self.bitmap_count,
+                'unique_bitmaps': len(self.bitmaps),
+                'savedbytes': self.savedbytes}
+
+
+def _shared_memory():
+    # -> `multiprocessing.resource_tracker` and `.shared_memory`, imported
+    # when a font is published or attached, not with the package
+    try:
+        from multiprocessing import resource_tracker, shared_memory
+    except ImportError:
+        raise ImportError("Shared memory fonts require Python 3.8+")
+    return resource_tracker, shared_memory
+
+
+def _compiled_source_key(file_path, file_hash=True):
+    st = os.stat(file_path)
+    if not file_hash:
+        return st.st_size, st.st_mtime_ns, None
+    h = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return st.st_size, st.st_mtime_ns, h.digest()
+
+
+def _compiled_is_fresh(compiled_path, file_path):
+    # Same size and mtime, or same size and content hash
+    try:
+        with open(compiled_path, 'rb') as f:
+            header = f.read(_COMPILED_HEADER.size)
+        (magic, version, _, size, mtime, sha1,
+         _, _, _, _) = _COMPILED_HEADER.unpack(header)
+    except (OSError, struct.error):
+        return False
+    if magic != _COMPILED_MAGIC or version != _COMPILED_VERSION:
+        return False
+    key = _compiled_source_key(file_path, False)
+    if key[0] != size:
+        return False
+    if key[1] == mtime:
+        return True
+    if _compiled_source_key(file_path)[2] != sha1:
+        return False
+    # touched but unchanged: store the new mtime so it is not hashed again
+    try:
+        with open(compiled_path, 'r+b') as f:
+            f.seek(_COMPILED_MTIME_OFFSET)
+            f.write(struct.pack('<q', key[1]))
+    except OSError:
+        pass
+    return True
+
+
+def _pad8(n):
+    return b'\0' * (-n % 8)
+
+
+# Keys of `Glyph.meta`, in the order of glyph meta lists
+_META_TITLES = (
+    'glyphname',
+    'codepoint',
+    'bbw',
+    'bbh',
+    'bbxoff',
+    'bbyoff',
+    'swx0',
+    'swy0',
+    'dwx0',
+    'dwy0',
+    'swx1',
+    'swy1',
+    'dwx1',
+    'dwy1',
+    'vvectorx',
+    'vvectory',
+    'hexdata',
+)
+
+_META_INDEX = dict((title, i) for i, title in enumerate(_META_TITLES))
+
+
 class Font(object):
     '''
     `Font` object
@@ -26,25 +811,7 @@ class Font(object):
 
     __PATTERN_VVECTOR_DELIMITER = re.compile(r'[,\s]+')
 
-    __META_TITLES = [
-        'glyphname',
-        'codepoint',
-        'bbw',
-        'bbh',
-        'bbxoff',
-        'bbyoff',
-        'swx0',
-        'swy0',
-        'dwx0',
-        'dwy0',
-        'swx1',
-        'swy1',
-        'dwx1',
-        'dwy1',
-        'vvectorx',
-        'vvectory',
-        'hexdata',
-    ]
+    __META_TITLES = _META_TITLES
 
     __EMPTY_GLYPH = {
         'glyphname': 'empty',
@@ -66,56 +833,442 @@ class Font(object):
         'hexdata': [],
     }
 
-    def __init__(self, *argv):
+    def __init__(self, *argv, **kwargs):
         '''
         Initialize a `Font` object. Load the BDF font file if a file path string or a file object is present.
 
+        Keyword arguments (e.g. `lazy=True`) are passed on to the loading method.
+
+        Glyph bitmaps drawn by `Glyph.draw()` (and so by `.drawcps()`) are cached in `.bitmapcache`, a `BitmapCache` object; set it to another `BitmapCache` to resize the cache, or to `None` to disable it.
+
         https://font.tomchen.org/bdfparser_py/font#font
         '''
 
-        if python_version < (3, 7, 0):
-            from collections import OrderedDict as ordered_dict
-        else:
-            ordered_dict = dict
-
-        self.headers = ordered_dict()
-        self.props = ordered_dict()
-        self.glyphs = ordered_dict()
+        self.headers = _ordered_dict()
+        self.props = _ordered_dict()
+        self.glyphs = _GlyphDict()
+        self.unencoded = []
 
         self.__glyph_count_to_check = None
         self.__curline_startchar = None
         self.__curline_chars = None
+        self.__f = None
+
+        self.__buf = None
+        self.__glyphs_pos = None
+        self.__lazy = False
+        self.__prefetch = None
+        self.__workers = None
+        self.__only = None
+        self.__skipped = 0
+        self.__stream = False
+        self.__stream_pending = False
+        self.__compact = False
+        self.__dedupe = None
+        self.__dedupe_stats = None
+
+        self.bitmapcache = BitmapCache()
+
+        self.__indexes = {}
+        self.__indexes_glyphs = None
+        self.__indexes_unencoded = None
+        self.__indexes_version = None
 
         l = len(argv)
         if l == 1:
             arg = argv[0]
             if isinstance(arg, str) or isinstance(arg, pathlib.Path):
-                self.load_file_path(arg)
+                self.load_file_path(arg, **kwargs)
             elif isinstance(arg, io.IOBase):
-                self.load_file_obj(arg)
+                self.load_file_obj(arg, **kwargs)
+            elif isinstance(arg, (bytes, bytearray, memoryview, mmap.mmap)):
+                self.load_bytes(arg, **kwargs)
 
-    def load_file_path(self, file_path):
+    def load_file_path(self, file_path, lazy=False, prefetch=None, engine='text', workers=None, cache=None, only=None, compact=False, dedupe=False):
         '''
         Load the BDF font file in the file path.
 
+        * `lazy=True`: each glyph is parsed the first time it is looked up; `prefetch` (a page size in codepoints, or `True` for 256) also parses the rest of its codepoint page in a background thread.
+        * `engine='bytes'` (implied by `lazy` and `workers`): the file is memory-mapped and parsed by the bytes parser (see `.load_bytes()`).
+        * `workers=N`: the glyph section is parsed in `N` worker processes.
+        * `cache=True` (compiled file next to the font file) or `cache=<directory>`: the font is loaded from its compiled file (see `.save_compiled()`) while the BDF file is unchanged, otherwise parsed and compiled.
+        * `only` (as `r` in `.itercps()`): only the glyphs in these codepoints are loaded. `cache` is ignored with it.
+        * gzip, bzip2 and xz compressed files are decompressed on the fly; the bytes engine (and so `lazy` and `workers`) holds the whole decompressed font in memory.
+        * `compact=True`: the glyphs are stored as packed arrays (see `.compact()`). Ignored with `lazy=True`.
+        * `dedupe=True`: identical bitmap rows and bitmaps are shared (see `.dedupe_stats()`), so changing a glyph's `hexdata` in place changes the glyphs sharing it; assign a new list instead. Ignored with `lazy=True` or `compact=True`.
+
         https://font.tomchen.org/bdfparser_py/font#load_file_path
         '''
 
-        with open(file_path) as file_obj:
-            self.load_file_obj(file_obj)
+        if cache and only is None:
+            compiled_path = self.__compiled_path(file_path, cache)
+            if _compiled_is_fresh(compiled_path, file_path):
+                self.load_compiled(compiled_path)
+                self.glyphs.keep = not compact
+                return self
+            # taken before parsing: a file changed meanwhile does not match
+            source_key = _compiled_source_key(file_path)
+            self.load_file_path(file_path, lazy, prefetch,
+                                engine, workers, compact=compact, dedupe=dedupe)
+            try:
+                self.__save_compiled(compiled_path, source_key)
+            except OSError as e:
+                warnings.warn("Cannot write the compiled font file: " + str(e))
+            return self
+
+        if lazy or workers or engine == 'bytes':
+            with _open_file(file_path, binary=True) as file_obj:
+                self.load_file_obj(file_obj, lazy=lazy, prefetch=prefetch, workers=workers,
+                                   only=only, compact=compact, dedupe=dedupe)
+        else:
+            with _open_file(file_path) as file_obj:
+                self.load_file_obj(file_obj, only=only,
+                                   compact=compact, dedupe=dedupe)
         return self
 
-    def load_file_obj(self, file_obj):
+    def load_file_obj(self, file_obj, lazy=False, prefetch=None, workers=None, only=None, compact=False, dedupe=False):
         '''
         Load the BDF font file object.
 
+        Binary file objects (and text file objects with `lazy` or `workers`) are loaded by the bytes parser. See `.load_file_path()` for `lazy`, `prefetch`, `workers`, `only`, `compact` and `dedupe`.
+
         https://font.tomchen.org/bdfparser_py/font#load_file_obj
         '''
 
-        self.__f = file_obj
-        self.__parse_headers()
+        if lazy or workers or isinstance(file_obj, (io.RawIOBase, io.BufferedIOBase)):
+            self.load_bytes(_file_buffer(file_obj), lazy=lazy, prefetch=prefetch,
+                            workers=workers, only=only, compact=compact, dedupe=dedupe)
+        else:
+            self.__only = only
+            self.__compact = compact
+            self.__dedupe = _BitmapInterner() if dedupe else None
+            self.__f = file_obj
+            self.__parse_headers()
+        return self
+
+    def load_bytes(self, buf, lazy=False, prefetch=None, workers=None, only=None, compact=False, dedupe=False):
+        '''
+        Load the BDF font from a `bytes`, `bytearray`, `memoryview` or `mmap.mmap` buffer.
+
+        See `.load_file_path()` for the keyword arguments. With `lazy=True` the buffer is referenced, not copied, and must not be modified afterwards.
+        '''
+
+        if isinstance(buf, memoryview) and buf.format != 'B':
+            buf = buf.cast('B')
+        self.__lazy = lazy
+        self.__prefetch = prefetch
+        self.__workers = workers
+        self.__only = only
+        self.__compact = compact
+        self.__dedupe = _BitmapInterner() if dedupe else None
+        self.__load_buffer(buf)
+        return self
+
+    @classmethod
+    async def aload(cls, file, chunksize=65536, executor=None):
+        '''
+        Asynchronously load the BDF font file (a file path or a file object) into a new `Font` object.
+
+        The file is read in `chunksize`-byte chunks in `executor` and parsed between reads, so the event loop is not blocked and the task can be cancelled.
+        '''
+
+        import asyncio  # only needed here, not imported with the package
+        if python_version < (3, 7, 0):
+            loop = asyncio.get_event_loop()
+        else:
+            loop = asyncio.get_running_loop()
+        if isinstance(file, (str, pathlib.Path)):
+            file_obj = await loop.run_in_executor(executor, _open_file, file, True)
+        else:
+            file_obj = file
+        parser = FontParser(cls())
+        try:
+            while 1:
+                chunk = await loop.run_in_executor(executor, file_obj.read, chunksize)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+        finally:
+            if file_obj is not file:
+                file_obj.close()
+        return parser.close()
+
+    def iterparse(self, file, glyph=False, only=None):
+        '''
+        Load the headers and properties of the BDF font file (a file path or a file object), then return an iterator of its glyph meta lists (or `Glyph` objects with `glyph=True`), which are not kept in `.glyphs`.
+
+        See `.load_file_path()` for `only`. The glyph count next to `CHARS` is checked once the iterator is exhausted.
+        '''
+
+        if isinstance(file, (str, pathlib.Path)):
+            file_obj = _open_file(file)
+            close = file_obj.close
+        elif isinstance(file, (io.RawIOBase, io.BufferedIOBase)):
+            file_obj = io.TextIOWrapper(file, encoding='utf-8', errors='replace')
+            close = file_obj.detach
+        else:
+            file_obj = file
+            close = None
+        self.__stream = True
+        self.__stream_pending = False
+        self.__only = only
+        try:
+            self.__f = file_obj
+            self.__parse_headers()
+            pending = self.__stream_pending
+        except BaseException:
+            if close is not None:
+                close()
+            raise
+        finally:
+            # the glyphs are read by the generator, which sets the file again
+            self.__stream = self.__stream_pending = False
+            self.__f = None
+        if not pending and close is not None:
+            close()
+            close = None
+        return self.__iterparse_glyphs(file_obj if pending else None, only, glyph, close)
+
+    def __iterparse_glyphs(self, file_obj, only, glyph, close):
+        try:
+            if file_obj is None:
+                return
+            self.__f = file_obj
+            self.__only = only
+            l = 0
+            for glyph_meta in self.__iter_glyphs():
+                l += 1
+                if glyph:
+                    yield Glyph.fromlist(glyph_meta, self)
+                else:
+                    yield glyph_meta
+            self.__prepare_glyphs_after(l + self.__skipped)
+        finally:
+            self.__f = None
+            if close is not None:
+                close()
+
+    def compact(self):
+        '''
+        Store the glyphs as packed arrays instead of glyph meta lists.
+
+        Glyph meta lists are then built on lookup and not kept: assign a new one to `.glyphs[codepoint]` to change a glyph.
+        '''
+
+        self.glyphs = _PackedGlyphs.pack(self.glyphs.items(), keep=False)
+        return self
+
+    def addglyph(self, glyph_meta):
+        '''
+        Add a glyph meta list to the font.
+
+        It goes to `.glyphs` under its codepoint; a glyph it replaces there, or a glyph without a codepoint (`ENCODING -1`), goes to `.unencoded`, where it can still be found by `.glyphbyname()`.
+        '''
+
+        cp = glyph_meta[1]
+        if cp is None or cp < 0:
+            self.unencoded.append(glyph_meta)
+            return
+        glyphs = self.glyphs
+        if cp in glyphs:
+            self.unencoded.append(glyphs[cp])
+        glyphs[cp] = glyph_meta
+
+    def __packglyphs(self, glyph_metas):
+        # Compact store of the glyphs with a codepoint, the others go to `.unencoded`
+        def encoded():
+            for glyph_meta in glyph_metas:
+                cp = glyph_meta[1]
+                if cp is None or cp < 0:
+                    self.unencoded.append(glyph_meta)
+                else:
+                    yield cp, glyph_meta
+        self.glyphs = _PackedGlyphs.pack(encoded(), keep=False)
+        self.unencoded.extend(self.glyphs.replaced())
+
+    def save_compiled(self, file_path, source=None):
+        '''
+        Save the font to a compiled binary file, which `.load_compiled()` loads without parsing.
+
+        `source` is the BDF file it is checked against by `.load_file_path(..., cache=...)`. The file is renamed into place once written.
+        '''
+
+        return self.__save_compiled(file_path, None if source is None else _compiled_source_key(source))
+
+    def __save_compiled(self, file_path, source_key):
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(file_path)))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for data in self.__compiled_parts(source_key):
+                    f.write(data)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return self
+
+    def __compiled_parts(self, source_key=None):
+        # `bytes` parts of the compiled font file, padding included
+        if source_key is None:
+            size, mtime, sha1 = 0, 0, bytes(20)
+        else:
+            size, mtime, sha1 = source_key
+        packed = _PackedGlyphs.pack(self.glyphs.items())
+        meta = json.dumps({'headers': self.headers,
+                           'props': self.props,
+                           'unencoded': self.unencoded,
+                           'declared': self.__glyph_count_to_check}).encode('utf-8')
+        header = _COMPILED_HEADER.pack(_COMPILED_MAGIC, _COMPILED_VERSION, 0, size, mtime, sha1, len(
+            packed), len(meta), len(packed.sections[3]), len(packed.sections[5]))
+        parts = []
+        for part in (header, meta) + packed.sections:
+            if isinstance(part, array) and sys.byteorder == 'big':
+                part = array(part.typecode, part)
+                part.byteswap()
+            data = bytes(part)
+            parts.append(data)
+            parts.append(_pad8(len(data)))
+        return parts
+
+    def publish(self, name=None):
+        '''
+        Publish the font to a new shared memory block (named `name`, or a generated name), in the compiled font file format, for other processes to use it with `Font.attach()`. Requires Python 3.8+.
+
+        Returns the `multiprocessing.shared_memory.SharedMemory` object, whose `.name` is to be passed to `Font.attach()`. The publishing process owns the block: keep it while other processes use it, then `.close()` and `.unlink()` it.
+        '''
+
+        shared_memory = _shared_memory()[1]
+        parts = self.__compiled_parts()
+        shm = shared_memory.SharedMemory(
+            name, create=True, size=sum(len(data) for data in parts))
+        pos = 0
+        for data in parts:
+            shm.buf[pos:pos + len(data)] = data
+            pos += len(data)
+        return shm
+
+    @classmethod
+    def attach(cls, name):
+        '''
+        Get a `Font` object reading a font published by `.publish()` (possibly in another process) in place, from the shared memory block named `name`. Requires Python 3.8+.
+
+        Nothing is parsed or copied: glyph meta lists are built from the shared block when glyphs are looked up, as with `.load_compiled()`. The block is attached read-only and stays open as long as the font's glyphs are referenced.
+        '''
+
+        (resource_tracker, shared_memory) = _shared_memory()
+        if python_version >= (3, 13, 0):
+            shm = shared_memory.SharedMemory(name, track=False)
+        else:
+            # A resource tracker started here (i.e. not shared with the
+            # publishing process) would unlink the block when this process
+            # exits: only the publishing process may unlink it
+            own_tracker = getattr(
+                resource_tracker._resource_tracker, '_fd', None) is None
+            shm = shared_memory.SharedMemory(name)
+            if os.name == 'posix' and own_tracker:
+                resource_tracker.unregister(shm._name, 'shared_memory')
+        font = cls()
+        font.__load_compiled_buffer(shm.buf.toreadonly(), owner=shm)
+        return font
+
+    def load_compiled(self, file_path):
+        '''
+        Load a compiled font file saved by `.save_compiled()`.
+
+        The file is memory-mapped and read in place: glyph meta lists are built from it when glyphs are looked up, so processes loading the same compiled file share one read-only copy of it.
+        '''
+
+        with open(file_path, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__load_compiled_buffer(buf)
         return self
 
+    def __getstate__(self):
+        # Pickled in the compiled font file format, without the file object,
+        # the buffer or the cached bitmaps
+        return {'compiled': b''.join(self.__compiled_parts()),
+                'keep': getattr(self.glyphs, 'keep', True),
+                'skipped': self.__skipped,
+                'dedupe_stats': self.__dedupe_stats,
+                'bitmapcache': (self.bitmapcache.maxsize, self.bitmapcache.maxpixels)}
+
+    def __setstate__(self, state):
+        Font.__init__(self)
+        self.__load_compiled_buffer(state['compiled'])
+        self.glyphs.keep = state['keep']
+        self.__skipped = state['skipped']
+        self.__dedupe_stats = state['dedupe_stats']
+        self.bitmapcache = BitmapCache(*state['bitmapcache'])
+
+    def __copy__(self):
+        # `copy` keeps its attribute-wise behavior, only pickling goes
+        # through the compiled font file format
+        font = self.__class__.__new__(self.__class__)
+        font.__dict__.update(self.__dict__)
+        return font
+
+    def __deepcopy__(self, memo):
+        font = self.__class__.__new__(self.__class__)
+        memo[id(self)] = font
+        for k, v in self.__dict__.items():
+            font.__dict__[k] = copy.deepcopy(v, memo)
+        return font
+
+    def __load_compiled_buffer(self, buf, owner=None):
+        (magic, version, _, _, _, _, n, meta_len, names_len,
+         bitmaps_len) = _COMPILED_HEADER.unpack_from(buf)
+        if magic != _COMPILED_MAGIC:
+            raise Exception("Not a compiled BDF font file")
+        if version != _COMPILED_VERSION:
+            raise Exception(
+                "Unsupported compiled BDF font file version " + str(version))
+        view = memoryview(buf)
+        parts = []
+        pos = _COMPILED_HEADER.size + len(_pad8(_COMPILED_HEADER.size))
+        for length in (meta_len, 4 * n, 4 * n * _PACKED_FIELDS, 4 * (n + 1), names_len, 4 * (n + 1), bitmaps_len):
+            parts.append(view[pos:pos + length])
+            pos += length + len(_pad8(length))
+        meta = json.loads(bytes(parts[0]).decode('utf-8'),
+                          object_pairs_hook=_ordered_dict)
+        for i, typecode in ((1, 'i'), (2, 'i'), (3, 'I'), (5, 'I')):
+            if sys.byteorder == 'big':
+                parts[i] = array(typecode, bytes(parts[i]))
+                parts[i].byteswap()
+            else:
+                parts[i] = parts[i].cast(typecode)
+        self.headers = meta['headers']
+        self.props = meta['props']
+        self.unencoded = meta.get('unencoded', [])
+        self.__glyph_count_to_check = meta.get('declared')
+        self.glyphs = _PackedGlyphs(
+            *parts[1:], owner=buf if owner is None else owner)
+
+    @staticmethod
+    def __compiled_path(file_path, cache):
+        file_path = os.path.abspath(file_path)
+        if cache is True:
+            return file_path + '.bdfc'
+        return os.path.join(cache, os.path.basename(file_path) + '.' + hashlib.sha1(
+            file_path.encode('utf-8')).hexdigest()[:8] + '.bdfc')
+
+    def __load_buffer(self, buf):
+        # Headers and properties are decoded and go through the line parser,
+        # the glyph section is scanned directly in the buffer
+        m = _PATTERN_FIRST_STARTCHAR.search(buf)
+        if m is None:
+            self.__glyphs_pos = head_end = len(buf)
+        else:
+            self.__glyphs_pos = m.start()
+            head_end = m.end()
+        self.__f = iter(bytes(buf[:head_end]).decode(
+            'utf-8', 'replace').split('\n'))
+        self.__buf = buf
+        try:
+            self.__parse_headers()
+        finally:
+            self.__buf = None
+
     def __parse_headers(self):
 
         while 1:
@@ -253,6 +1406,33 @@ class Font(object):
 
     def __prepare_glyphs(self):
 
+        if self.__buf is not None:
+            self.__prepare_glyphs_buffer()
+            return
+
+        if self.__stream:
+            # glyphs are read one by one by `.iterparse()`
+            self.__stream_pending = True
+            return
+
+        if self.__compact:
+            self.__packglyphs(self.__iter_glyphs())
+        else:
+            for glyph_meta in self.__deduped(self.__iter_glyphs()):
+                self.addglyph(glyph_meta)
+        self.__prepare_glyphs_after()
+
+    def __deduped(self, glyph_metas):
+        interner = self.__dedupe
+        if interner is None or self.__compact:
+            return glyph_metas
+        return interner.glyphs(glyph_metas)
+
+    def __iter_glyphs(self):
+
+        wanted = None if self.__only is None else _codepoint_filter(
+            self.__only)
+
         glyph_meta = []
         glyph_bitmap = []
         glyph_bitmap_is_on = False
@@ -268,7 +1448,6 @@ class Font(object):
 
             if line is None:
                 warnings.warn("This font does not have 'ENDFONT' keyword")
-                self.__prepare_glyphs_after()
                 return
 
             kvlist = line.split(None, 1)
@@ -283,9 +1462,18 @@ class Font(object):
                     STARTCHAR_used = True
                     glyph_end = False
                 elif not ENCODING_used and key == 'ENCODING':
-                    glyph_codepoint = int(value)
+                    glyph_codepoint = int(value.split()[0])
                     glyph_meta[1] = glyph_codepoint
                     ENCODING_used = True
+                    if wanted is not None and not wanted(glyph_codepoint):
+                        # skip to the end of the glyph
+                        for line in self.__f:
+                            if line.strip() == 'ENDCHAR':
+                                break
+                        self.__skipped += 1
+                        glyph_bitmap_is_on = False
+                        STARTCHAR_used = ENCODING_used = BBX_used = SWIDTH_used = DWIDTH_used = SWIDTH1_used = DWIDTH1_used = VVECTOR_used = BITMAP_used = False
+                        glyph_end = True
                 elif not BBX_used and key == 'BBX':
                     nlist = value.split()
                     glyph_meta[2] = int(nlist[0])
@@ -328,17 +1516,78 @@ class Font(object):
                 elif key == 'ENDCHAR':
                     glyph_bitmap_is_on = False
                     glyph_meta[16] = glyph_bitmap
-                    self.glyphs[glyph_codepoint] = glyph_meta
+                    if wanted is not None and not ENCODING_used:
+                        # no codepoint to be in `only`, as in the bytes parser
+                        self.__skipped += 1
+                    else:
+                        yield glyph_meta
                     STARTCHAR_used = ENCODING_used = BBX_used = SWIDTH_used = DWIDTH_used = SWIDTH1_used = DWIDTH1_used = VVECTOR_used = BITMAP_used = False
                     glyph_end = True
                 elif glyph_end and key == 'ENDFONT':
-                    self.__prepare_glyphs_after()
                     return
                 elif glyph_bitmap_is_on:
                     glyph_bitmap.append(key)
 
-    def __prepare_glyphs_after(self):
-        l = len(self.glyphs)
+    def __prepare_glyphs_buffer(self):
+        self.__curline_startchar = None
+        buf = self.__buf
+        if self.__lazy:
+            scan = _GlyphScan(buf, self.__glyphs_pos, self.__only)
+            spans = _ordered_dict()
+            for codepoint, start, bitmap_start, bitmap_end in scan:
+                span = (start, bitmap_start, bitmap_end)
+                if codepoint is None or codepoint < 0:
+                    self.unencoded.append(_parse_glyph(buf, *span))
+                    continue
+                if codepoint in spans:
+                    self.unencoded.append(_parse_glyph(buf, *spans[codepoint]))
+                spans[codepoint] = span
+            self.glyphs = _LazyGlyphs(buf, spans, self.__prefetch)
+        elif self.__workers and self.__workers > 1:
+            self.__prepare_glyphs_parallel()
+            return
+        elif self.__compact:
+            scan = _GlyphReader(buf, self.__glyphs_pos, self.__only)
+            self.__packglyphs(scan)
+        else:
+            scan = _GlyphReader(buf, self.__glyphs_pos, self.__only)
+            for glyph_meta in self.__deduped(scan):
+                self.addglyph(glyph_meta)
+        self.__skipped = scan.skipped
+        if not scan.endfont:
+            warnings.warn("This font does not have 'ENDFONT' keyword")
+        self.__prepare_glyphs_after()
+
+    def __prepare_glyphs_parallel(self):
+        bounds = _split_glyph_section(
+            self.__buf, self.__glyphs_pos, self.__workers)
+        with memoryview(self.__buf) as view:
+            chunks = [view[start:end].tobytes()
+                      for start, end in zip(bounds, bounds[1:])]
+        with ProcessPoolExecutor(max_workers=self.__workers) as executor:
+            results = list(executor.map(
+                _parse_glyph_chunk, chunks, [self.__only] * len(chunks)))
+        glyph_metas = (glyph_meta for sections, _, _ in results
+                       for glyph_meta in _unpack_glyph_chunk(sections))
+        if self.__compact:
+            self.__packglyphs(glyph_metas)
+        else:
+            for glyph_meta in self.__deduped(glyph_metas):
+                self.addglyph(glyph_meta)
+        self.__skipped += sum(skipped for _, _, skipped in results)
+        if not results[-1][1]:
+            warnings.warn("This font does not have 'ENDFONT' keyword")
+        self.__prepare_glyphs_after()
+
+    def __prepare_glyphs_after(self, l=None):
+        self.__f = None  # all read, do not keep the file object
+        if self.__dedupe is not None and not self.__compact and not self.__lazy:
+            # the lookup tables are not needed any more
+            self.__dedupe_stats = self.__dedupe.stats()
+        self.__dedupe = None
+        if l is None:
+            # glyphs skipped by `only` still count
+            l = len(self.glyphs) + len(self.unencoded) + self.__skipped
         if self.__glyph_count_to_check != l:
             if self.__glyph_count_to_check is None:
                 warnings.warn(
@@ -367,6 +1616,20 @@ class Font(object):
         '''
         return self.length()
 
+    def dedupe_stats(self):
+        '''
+        Get a `dict` of the savings of the font loaded with `dedupe=True` (`None` otherwise): `rows` and `bitmaps`, the bitmap row and glyph bitmap counts; `unique_rows` and `unique_bitmaps`, how many distinct ones are actually stored; `savedbytes`, an estimate of the memory saved.
+        '''
+
+        return None if self.__dedupe_stats is None else dict(self.__dedupe_stats)
+
+    def declaredlength(self):
+        '''
+        Returns the glyph count next to the `CHARS` keyword in the font file, or `None` if there is none.
+        '''
+
+        return self.__glyph_count_to_check
+
     def itercps(self, order=1, r=None):
         '''
         Almost identical to `.iterglyphs()`, except it returns an `iterator` of glyph codepoints instead of an `iterator` of `Glyph` objects.
@@ -374,32 +1637,84 @@ class Font(object):
         https://font.tomchen.org/bdfparser_py/font#itercps
         '''
 
+        if order == 1 or order == 2:
+            cps = self.__sortedcps()
+            if r is not None:
+                cps = self.__sortedrange(cps, r)
+            return iter(cps) if order == 1 else reversed(cps)
         ks = self.glyphs.keys()
-        if order == 1:
-            retiterator = iter(sorted(ks))
-        elif order == 0:
+        if order == 0:
             retiterator = iter(ks)
-        elif order == 2:
-            retiterator = iter(sorted(ks, reverse=True))
         elif order == -1:
             try:
                 retiterator = reversed(ks)
             except TypeError:
                 retiterator = reversed(list(ks))  # Python <=3.7
         if r is not None:
-            def f(cp):
-                if isinstance(r, int):
-                    return cp < r
-                elif isinstance(r, tuple):
-                    return cp <= r[1] and cp >= r[0]
-                elif isinstance(r, list):
-                    for t in r:
-                        if cp <= t[1] and cp >= t[0]:
-                            return True
-                    return False
-            retiterator = filter(f, retiterator)
+            retiterator = filter(_codepoint_filter(r), retiterator)
         return retiterator
 
+    def __glyphsindex(self, name, build):
+        # Indexes built from the glyphs by `build()`, kept until the glyphs change
+        glyphs = self.glyphs
+        unencoded = self.unencoded
+        version = getattr(glyphs, 'version', None)
+        if version is None:
+            return build()
+        version = (version, len(unencoded))
+        if glyphs is not self.__indexes_glyphs or unencoded is not self.__indexes_unencoded or version != self.__indexes_version:
+            self.__indexes = {}
+            self.__indexes_glyphs = glyphs
+            self.__indexes_unencoded = unencoded
+            self.__indexes_version = version
+        index = self.__indexes.get(name)
+        if index is None:
+            index = self.__indexes[name] = build()
+        return index
+
+    def __sortedcps(self):
+        return self.__glyphsindex('sorted', lambda: sorted(self.glyphs.keys()))
+
+    def __missingpattern(self):
+        return self.__glyphsindex('missing', lambda: _missing_pattern(self.__sortedcps()))
+
+    def __nameindex(self):
+        # Glyph name -> codepoint, or glyph meta list of `.unencoded`; glyphs
+        # with a codepoint take precedence
+        def build():
+            index = dict((glyph_meta[0], glyph_meta)
+                         for glyph_meta in self.unencoded)
+            glyphs = self.glyphs
+            if isinstance(glyphs, _GlyphMapping):
+                index.update(glyphs.names())
+            else:
+                index.update((glyph_meta[0], cp)
+                             for cp, glyph_meta in glyphs.items())
+            return index
+        return self.__glyphsindex('names', build)
+
+    @staticmethod
+    def __sortedrange(cps, r):
+        # Codepoints of sorted `cps` in `r` (as in `.itercps()`), by bisection
+        if isinstance(r, int):
+            return cps[:bisect.bisect_left(cps, r)]
+        elif isinstance(r, tuple):
+            ranges = [r]
+        elif isinstance(r, list):
+            ranges = sorted(r)
+        else:
+            return []
+        ret = []
+        end = None
+        for start, stop in ranges:
+            if end is not None and start <= end:
+                start = end + 1  # overlapping ranges
+            if start > stop:
+                continue
+            ret.extend(cps[bisect.bisect_left(cps, start):bisect.bisect_right(cps, stop)])
+            end = stop if end is None else max(end, stop)
+        return ret
+
     def iterglyphs(self, order=1, r=None):
         '''
         Returns an iterator of all the glyphs (as `Glyph` objects) in the font (default) or in the specified codepoint range in the font, sorted by the specified order (or by the ascending codepoint order by default).
@@ -425,7 +1740,21 @@ class Font(object):
             # Use old style for Python 3.5 support. For 3.6+:
             # f"Glyph \"{chr(codepoint)}\" (codepoint {str(codepoint)}) does not exist in the font. Will return `None`"
             return None
-        return Glyph(dict(zip(self.__META_TITLES, self.glyphs[codepoint])), self)
+        return Glyph.fromlist(self.glyphs[codepoint], self)
+
+    def glyphbyname(self, name):
+        '''
+        Get a glyph (as `Glyph` object) by its name (next to the `STARTCHAR` keyword), including the glyphs in `.unencoded`. Returns `None` if there is no such glyph.
+
+        The name index is built the first time and kept until the glyphs change.
+        '''
+
+        entry = self.__nameindex().get(name)
+        if entry is None:
+            return None
+        if isinstance(entry, list):
+            return Glyph.fromlist(entry, self)
+        return Glyph.fromlist(self.glyphs[entry], self)
 
     def glyph(self, character):
         '''
@@ -443,12 +1772,50 @@ class Font(object):
         https://font.tomchen.org/bdfparser_py/font#lacksglyphs
         '''
 
-        l = []
-        for cp, char in ((ord(char), char) for char in string):
-            if cp not in self.glyphs:
-                l.append(char)
+        l = self.__missingpattern().findall(string)
         return l if len(l) != 0 else None
 
+    def covers(self, string):
+        '''
+        Check if the font has the glyphs of all the characters of the string.
+        '''
+
+        return self.__missingpattern().search(string) is None
+
+    def coverage(self, texts):
+        '''
+        Check the coverage of the font over a corpus: a `str`, or an iterable of `str`s and / or text file objects. Line breaks (`'\\n'` and `'\\r'`) are not counted.
+
+        Returns a `dict` with the number of characters checked (`'chars'`), the number of them the font lacks (`'missing'`), and the counts of each missing character (`'missingchars'`) and of the missing characters in each Unicode block (`'blocks'`), from the most to the least frequent.
+        '''
+
+        pattern = self.__missingpattern()
+        chars = 0
+        missingchars = {}
+        if isinstance(texts, str):
+            texts = (texts,)
+        for text in texts:
+            lines = (text,) if isinstance(text, str) else text
+            for line in lines:
+                line = line.replace('\n', '').replace('\r', '')
+                chars += len(line)
+                for char in pattern.findall(line):
+                    missingchars[char] = missingchars.get(char, 0) + 1
+        blocks = {}
+        for char, n in missingchars.items():
+            block = _unicode_block(ord(char))
+            blocks[block] = blocks.get(block, 0) + n
+
+        def by_count(d):
+            return _ordered_dict(sorted(d.items(), key=lambda item: -item[1]))
+
+        return {
+            'chars': chars,
+            'missing': sum(missingchars.values()),
+            'missingchars': by_count(missingchars),
+            'blocks': by_count(blocks),
+        }
+
     def drawcps(self, cps, linelimit=512, mode=1, direction='lrtb', usecurrentglyphspacing=False, missing=None):
         '''
         Draw the glyphs of the specified codepoints, to a `Bitmap` object.
@@ -550,7 +1917,8 @@ class Font(object):
 
                 offset = 0
                 if mode == 1:
-                    interglyph = glyph.meta[interglyph_str] or glyph.meta[interglyph_str2]
+                    interglyph = glyph.getmeta(
+                        interglyph_str) or glyph.getmeta(interglyph_str2)
                     if interglyph is None:
                         interglyph = interglyph_global
                     if interglyph is not None:
@@ -600,6 +1968,544 @@ class Font(object):
         return self.drawcps(self.itercps(order, r), linelimit, mode, direction, usecurrentglyphspacing)
 
 
+class FontStack(Font):
+    '''
+    Stack of `Font` objects used as one font, each codepoint's glyph coming from the first font that has it
+
+    It has the same glyph lookup and drawing methods as `Font`.
+    '''
+
+    def __init__(self, fonts):
+        '''
+        Initialize a `FontStack` object from a `list` of `Font` objects, by order of preference. The codepoint -> font map is built once, here.
+
+        The stack's font bounding box (`FONTBOUNDINGBOX`) is the union of its fonts' bounding boxes, relative to their origins, and every glyph is drawn in it: glyphs of all the fonts share one baseline, and glyph spacing still follows each glyph's `DWIDTH`. The other headers (but global `DWIDTH`s, applied to each font's own glyphs) and the properties are the first font's.
+        '''
+
+        Font.__init__(self)
+        if len(fonts) == 0:
+            raise Exception("A FontStack needs at least one font")
+        self.fonts = list(fonts)
+        self.headers = _ordered_dict(self.fonts[0].headers)
+        for key in ('dwx0', 'dwy0', 'dwx1', 'dwy1'):
+            # per font, see `_StackedGlyphs`
+            self.headers.pop(key, None)
+        self.props = _ordered_dict(self.fonts[0].props)
+        boxes = [(fh['fbbxoff'], fh['fbbyoff'], fh['fbbxoff'] + fh['fbbx'], fh['fbbyoff'] + fh['fbby'])
+                 for fh in (font.headers for font in self.fonts) if 'fbbx' in fh]
+        if boxes:
+            left = min(box[0] for box in boxes)
+            bottom = min(box[1] for box in boxes)
+            self.headers['fbbx'] = max(box[2] for box in boxes) - left
+            self.headers['fbby'] = max(box[3] for box in boxes) - bottom
+            self.headers['fbbxoff'] = left
+            self.headers['fbbyoff'] = bottom
+        self.glyphs = _StackedGlyphs(self.fonts)
+
+    def __reduce__(self):
+        return (self.__class__, (self.fonts,))
+
+    def fontbycp(self, codepoint):
+        '''
+        Get the font (as `Font` object) the glyph of the codepoint comes from, or `None` if no font has it.
+        '''
+
+        if codepoint not in self.glyphs:
+            return None
+        return self.glyphs.font(codepoint)
+
+
+def iterparse(file, glyph=False, only=None):
+    '''
+    Parse the BDF font file (a file path or a file object) with a flat memory footprint: yields a `Font` object holding the headers and properties (but no glyphs) first, then each glyph as it is read, as a meta list or as a `Glyph` object with `glyph=True`.
+
+    Earlier glyphs are not kept. See `Font.iterparse()`.
+    '''
+
+    font = Font()
+    glyphs = font.iterparse(file, glyph, only)
+    yield font
+    for g in glyphs:
+        yield g
+
+
+async def aload_many(files, chunksize=65536, executor=None):
+    '''
+    Asynchronously load many BDF font files (file paths or file objects) concurrently, and return a `list` of `Font` objects in the same order.
+
+    See `Font.aload()`. Cancelling it cancels the loading of all the fonts.
+    '''
+
+    import asyncio
+    return await asyncio.gather(*[Font.aload(file, chunksize, executor) for file in files])
+
+
+class FontInfo(object):
+    '''
+    Headers and properties of a BDF font, returned by `probe()`
+    '''
+
+    def __init__(self, headers, props, chars, codepoints=None):
+        '''
+        Initialize a `FontInfo` object. `chars` is the glyph count next to the `CHARS` keyword, `codepoints` a `list` of the glyph codepoints in file order (if probed).
+        '''
+
+        self.headers = headers
+        self.props = props
+        self.chars = chars
+        self.codepoints = codepoints
+
+    def __repr__(self):
+        '''
+        Gets a short `str` representation of the `FontInfo` object.
+        '''
+
+        return '<FontInfo ' + repr(self.headers.get('fontname')) + ', ' + str(self.chars) + ' chars>'
+
+
+def probe(file_path, codepoints=False):
+    '''
+    Read only the headers and properties of the BDF font file in the file path, without parsing its glyphs, and return them as a `FontInfo` object.
+
+    Reading stops at the `CHARS` line (or the first `STARTCHAR` line). With `codepoints=True`, the glyph codepoints are also collected from a scan of the `ENCODING` lines alone.
+    '''
+
+    font = Font()
+    with _open_file(file_path) as file_obj:
+        font.iterparse(file_obj)
+    cps = None
+    if codepoints:
+        with _open_file(file_path, binary=True) as file_obj:
+            buf = _file_buffer(file_obj)
+            cps = [int(m.group(1).split()[0])
+                   for m in _PATTERN_ENCODING.finditer(buf)]
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+    return FontInfo(font.headers, font.props, font.declaredlength(), cps)
+
+
+class _LineQueue(object):
+    # Line source of `FontParser`, drained by the line parser
+
+    def __init__(self):
+        self.lines = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.lines:
+            return self.lines.popleft()
+        raise StopIteration
+
+
+class FontParser(object):
+    '''
+    Incremental (push) BDF font parser, for fonts received in chunks
+
+    Feed it chunks of the font file with `.feed()`, which returns the glyphs completed so far, then call `.close()`.
+    '''
+
+    def __init__(self, font=None):
+        '''
+        Initialize a `FontParser` object, which loads the font into `font` (a new `Font` object by default).
+        '''
+
+        self.font = Font() if font is None else font
+        self.__queue = _LineQueue()
+        self.__decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        self.__partial = ''
+        self.__glyphs = None
+        self.__ready = 0
+        self.__closed = False
+
+    def feed(self, data):
+        '''
+        Feed a chunk (`bytes` or `str`) of the font file, and return a `list` of the glyphs (as meta lists, in the order of `Glyph.meta` keys) completed by it.
+
+        The headers and properties are parsed as soon as the first `STARTCHAR` line is received. Completed glyphs are also added to the font's `.glyphs`.
+        '''
+
+        if self.__closed:
+            raise Exception("Cannot feed a closed FontParser")
+        if not isinstance(data, str):
+            data = self.__decoder.decode(data)
+        lines = (self.__partial + data).split('\n')
+        self.__partial = lines.pop()
+        self.__push(lines)
+        return self.__emit()
+
+    def close(self):
+        '''
+        Finish parsing the font, and return the `Font` object.
+        '''
+
+        if not self.__closed:
+            self.__closed = True
+            rest = self.__partial + self.__decoder.decode(b'', True)
+            self.__partial = ''
+            self.__push([rest] if rest else [])
+            if self.__glyphs is None:
+                if not self.__queue.lines:
+                    raise Exception("No BDF font data was fed")
+                self.__glyphs = self.font.iterparse(self.__queue)
+            for glyph_meta in self.__glyphs:
+                self.font.addglyph(glyph_meta)
+        return self.font
+
+    def __push(self, lines):
+        for line in lines:
+            kvlist = line.split()
+            if len(kvlist) == 1 and kvlist[0] == 'ENDCHAR':
+                self.__ready += 1
+            elif self.__glyphs is None and kvlist and kvlist[0] in ('STARTCHAR', 'ENDFONT'):
+                self.__queue.lines.append(line)
+                self.__glyphs = self.font.iterparse(self.__queue)
+                continue
+            self.__queue.lines.append(line)
+
+    def __emit(self):
+        # the line parser is resumed only when a whole glyph is queued
+        emitted = []
+        if self.__glyphs is None:
+            return emitted
+        while self.__ready:
+            self.__ready -= 1
+            glyph_meta = next(self.__glyphs, None)
+            if glyph_meta is None:
+                break
+            self.font.addglyph(glyph_meta)
+            emitted.append(glyph_meta)
+        return emitted
+
+
+class BitmapCache(object):
+    '''
+    Bounded LRU cache of the glyph bitmaps drawn by `Glyph.draw()`, keyed by codepoint, glyph name, mode and bounding box
+
+    Each entry keeps a copy of its glyph meta list, so that glyphs changed since they were drawn are drawn again. Cached bitmaps are handed out as new `Bitmap` objects and are never modified. It can be shared by threads.
+    '''
+
+    def __init__(self, maxsize=1024, maxpixels=None):
+        '''
+        Initialize a `BitmapCache` object holding at most `maxsize` bitmaps and, if `maxpixels` is set, at most `maxpixels` pixels in total.
+        '''
+
+        self.maxsize = maxsize
+        self.maxpixels = maxpixels
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__pixels = 0
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_BitmapCache__lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    def get(self, key, glyph_meta):
+        '''
+        Get a copy of the cached bitmap of `key` drawn from `glyph_meta`, or `None`.
+        '''
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] == glyph_meta[:16] and entry[1] == glyph_meta[16]:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+            else:
+                entry = None
+                self.misses += 1
+        return None if entry is None else entry[2].clone()
+
+    def put(self, key, glyph_meta, bitmap):
+        '''
+        Cache a copy of `bitmap`, drawn from `glyph_meta`, as `key`.
+        '''
+
+        if not self.maxsize:
+            return
+        bitmap = bitmap.clone()
+        h = bitmap.height()
+        pixels = bitmap.width() * h if h else 0
+        if self.maxpixels is not None and pixels > self.maxpixels:
+            return
+        hexdata = glyph_meta[16]
+        entry = (glyph_meta[:16], list(hexdata) if hexdata is not None else None,
+                 bitmap, pixels)
+        with self.__lock:
+            self.__remove(key)
+            self.__entries[key] = entry
+            self.__pixels += pixels
+            while len(self.__entries) > self.maxsize or (self.maxpixels is not None and self.__pixels > self.maxpixels):
+                self.__pixels -= self.__entries.popitem(last=False)[1][3]
+                self.evictions += 1
+
+    def invalidate(self, codepoint=None):
+        '''
+        Remove the cached bitmaps of the glyph in the codepoint, or all cached bitmaps by default.
+        '''
+
+        with self.__lock:
+            if codepoint is None:
+                self.__entries.clear()
+                self.__pixels = 0
+            else:
+                for key in [key for key in self.__entries if key[0] == codepoint]:
+                    self.__remove(key)
+
+    def stats(self):
+        '''
+        Get the hit, miss and eviction counts and the current size of the cache, as a `dict`.
+        '''
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.__entries),
+            'pixels': self.__pixels,
+            'maxsize': self.maxsize,
+            'maxpixels': self.maxpixels,
+        }
+
+    def __remove(self, key):
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__pixels -= entry[3]
+
+
+# The font headers a pickled `Glyph` keeps: bounding box, name and spacing
+_GLYPH_FONT_HEADERS = ('fontname', 'fbbx', 'fbby', 'fbbxoff', 'fbbyoff',
+                       'metricsset', 'swx0', 'swy0', 'dwx0', 'dwy0',
+                       'swx1', 'swy1', 'dwx1', 'dwy1', 'vvectorx', 'vvectory')
+
+
+def _glyph_font_headers(font):
+    if font is None:
+        return None
+    return tuple((k, font.headers[k]) for k in _GLYPH_FONT_HEADERS if k in font.headers)
+
+
+def _glyph_font(headers):
+    # -> a lightweight owner `Font` carrying only `headers`
+    if headers is None:
+        return None
+    font = Font()
+    font.headers.update(headers)
+    return font
+
+
+def _unpickle_glyph(cls, values, rows, w, kind, data, headers):
+    values = list(values)
+    values.append(_unpack_hexdata(rows, w, kind, data))
+    return cls.fromlist(values, _glyph_font(headers))
+
+
+def _unpickle_glyph_meta(cls, meta, headers):
+    return cls(meta, _glyph_font(headers))
+
+
+def _pack_bindata(bindata):
+    # -> (row length, bytes) with 1 bit per pixel and rows padded to whole
+    # bytes, or `None` if rows differ in length or have pixels but '0'/'1'
+    w = len(bindata[0]) if bindata else 0
+    n = (w + 7) // 8
+    if w == 0 or any(len(r) != w for r in bindata):
+        return None
+    pad = '0' * (n * 8 - w)
+    try:
+        return w, b''.join(int(r + pad, 2).to_bytes(n, 'big') for r in bindata)
+    except ValueError:
+        return None
+
+
+def _unpack_bindata(w, data):
+    n = (w + 7) // 8
+    f = '0' + str(n * 8) + 'b'
+    return [format(int.from_bytes(data[i:i + n], 'big'), f)[:w] for i in range(0, len(data), n)]
+
+
+def _unpickle_bitmap(cls, w, data):
+    return cls(_unpack_bindata(w, data))
+
+
+# Bitmap planes: (width, `list` of rows of '1's, `list` of rows of '2's or
+# `None` if there are none), rows being `int` bitmasks with the leftmost pixel
+# as the most significant bit. Plane lists are never modified once built.
+
+
+def _bindata_planes(bindata):
+    # `None` if rows differ in length or have pixels but '0'/'1'/'2'
+    if not bindata:
+        return None
+    w = len(bindata[0])
+    ones = []
+    twos = None
+    for i, row in enumerate(bindata):
+        if len(row) != w or row.strip('012'):
+            return None
+        if '2' in row:
+            if twos is None:
+                twos = [0] * len(bindata)
+            twos[i] = int(row.replace('1', '0').replace('2', '1'), 2)
+            row = row.replace('2', '0')
+        ones.append(int(row, 2) if w else 0)
+    return w, ones, twos
+
+
+def _planes_bindata(w, ones, twos):
+    if w == 0:
+        return [''] * len(ones)
+    f = '0' + str(w) + 'b'
+    if twos is None:
+        return [format(one, f) for one in ones]
+    zeros = int.from_bytes(b'0' * w, 'big')
+    ret = []
+    for one, two in zip(ones, twos):
+        if two:
+            # add 1 to the '1's of the '2' pixels, as bytes (no carry)
+            ret.append((int.from_bytes(format(one | two, f).encode(), 'big') + int.from_bytes(
+                format(two, f).encode(), 'big') - zeros).to_bytes(w, 'big').decode())
+        else:
+            ret.append(format(one, f))
+    return ret
+
+
+def _planes_over(w, a, b):
+    # b over a, both as `(ones, twos)` of `w` pixel wide rows
+    (a1, a2), (b1, b2) = a, b
+    if a2 is None and b2 is None:
+        return w, [y | x for x, y in zip(a1, b1)], None
+    h = min(len(a1), len(b1))
+    a2 = a2 or [0] * h
+    b2 = b2 or [0] * h
+    ones = []
+    twos = []
+    for x1, x2, y1, y2 in zip(a1, a2, b1, b2):
+        keep = ~(y1 | y2)
+        ones.append(y1 | (x1 & keep))
+        twos.append(y2 | (x2 & keep))
+    return w, ones, twos
+
+
+def _planes_shift(planes, shift, mask=None):
+    # shift rows left (right if `shift` < 0), then keep the bits in `mask`
+    (_, ones, twos) = planes
+    if shift >= 0:
+        ones = [one << shift for one in ones]
+        twos = None if twos is None else [two << shift for two in twos]
+    else:
+        ones = [one >> -shift for one in ones]
+        twos = None if twos is None else [two >> -shift for two in twos]
+    if mask is not None:
+        ones = [one & mask for one in ones]
+        twos = None if twos is None else [two & mask for two in twos]
+    return ones, twos
+
+
+def _planes_crop(planes, w, h, xoff=0, yoff=0):
+    (width, ones, twos) = planes
+    (ones, twos) = _planes_shift(planes, w + xoff - width, (1 << w) - 1)
+    l = len(ones)
+    rows = [l - yoff - h + n for n in range(h)]
+    ones = [ones[bn] if 0 <= bn < l else 0 for bn in rows]
+    if twos is not None:
+        twos = [twos[bn] if 0 <= bn < l else 0 for bn in rows]
+    return w, ones, twos
+
+
+def _planes_compose(planeslist, w, h, positions, order):
+    # Draw bitmaps at their (x, y) positions, in `order`, each over the
+    # previous ones, on a canvas of '0'/'1'/'2' bytes allocated once: each
+    # pixel is copied once, or merged when it is drawn over ink
+    canvas = [bytearray(b'0' * w) for _ in range(h)]
+    for i in order:
+        planes = planeslist[i]
+        (pw, ones, twos) = planes
+        (x, y) = positions[i]
+        blank = b'0' * pw
+        if twos is None:
+            twos = [0] * len(ones)
+        for row, pixels, one, two in zip(canvas[y:y + len(ones)], _planes_bindata(*planes), ones, twos):
+            if not one | two:
+                continue
+            region = row[x:x + pw]
+            if region != blank:
+                # b over a, as in `_planes_over()`
+                keep = ~(one | two)
+                one |= int(region.replace(b'2', b'0'), 2) & keep
+                if b'2' in region:
+                    two |= int(region.replace(b'1', b'0').replace(
+                        b'2', b'1'), 2) & keep
+                pixels = _planes_bindata(pw, [one], [two])[0]
+            row[x:x + pw] = pixels.encode()
+    ones = [int(row.replace(b'2', b'0'), 2) if w else 0 for row in canvas]
+    twos = None
+    if any(b'2' in row for row in canvas):
+        twos = [int(row.replace(b'1', b'0').replace(b'2', b'1'), 2)
+                for row in canvas]
+    return w, ones, twos
+
+
+_BLIT_OPS = ('or', 'replace', 'xor', 'and', 'andnot')
+
+
+def _blit_clip(w, h, srcw, srch, x, y):
+    # -> (left, top, right, bottom) of the destination area drawn by a
+    # `srcw` * `srch` bitmap at (x, y) in a `w` * `h` one, or `None`
+    left = max(0, x)
+    top = max(0, y)
+    right = min(w, x + srcw)
+    bottom = min(h, y + srch)
+    if left >= right or top >= bottom:
+        return None
+    return left, top, right, bottom
+
+
+def _concat_layout(sizes, direction=1, align=1, offsetlist=None):
+    # Layout of bitmaps of `sizes` ((width, height) tuples) concatenated by
+    # `Bitmap.concatall()`: -> (width, height, (x, y) positions from the top
+    # left corner, the drawing order (each one over the previous ones))
+    horizontal = direction > 0
+    maxsize = max(size[1 if horizontal else 0] for size in sizes)
+    positions = []
+    lo = hi = 0  # bounds of the concatenated bitmaps, along the direction
+    offset = 0
+    for bi, (w, h) in enumerate(sizes):
+        if offsetlist and bi != 0:
+            offset = offsetlist[bi - 1]
+        length = w if horizontal else h
+        if direction == 1 or direction == 0:  # right or down
+            start = hi + offset
+        else:  # left or up, the previous ones are `offset` off this one
+            start = lo - length - offset
+        lo = min(lo, start)
+        hi = max(hi, start + length)
+        if horizontal:
+            cross = maxsize - h if align else 0  # bottom or top
+        else:
+            cross = 0 if align else maxsize - w  # left or right
+        positions.append((start, cross))
+    positions = [(start - lo, cross) if horizontal else (cross, start - lo)
+                 for start, cross in positions]
+    order = list(range(len(sizes)))
+    if direction == 2 or direction == -1:
+        order.reverse()
+    if horizontal:
+        return hi - lo, maxsize, positions, order
+    return maxsize, hi - lo, positions, order
+
+
 class Glyph(object):
     '''
     `Glyph` object
@@ -607,6 +2513,8 @@ class Glyph(object):
     https://font.tomchen.org/bdfparser_py/glyph
     '''
 
+    __slots__ = ('font', '__values', '__meta')
+
     def __init__(self, meta_dict, font):
         '''
         Initialize a `Glyph` object. Load a `dict` of meta information and the font the glyph belongs.
@@ -614,9 +2522,56 @@ class Glyph(object):
         https://font.tomchen.org/bdfparser_py/glyph#glyph
         '''
 
-        self.meta = meta_dict
+        self.__values = None
+        self.__meta = meta_dict
         self.font = font
 
+    @classmethod
+    def fromlist(cls, glyph_meta, font):
+        '''
+        Get a `Glyph` object viewing a glyph meta list (as the values of `Font.glyphs`) in place, without building its `dict` of meta information until `.meta` is used.
+        '''
+
+        glyph = cls.__new__(cls)
+        glyph.__values = glyph_meta
+        glyph.__meta = None
+        glyph.font = font
+        return glyph
+
+    @property
+    def meta(self):
+        '''
+        The `dict` of meta information of the glyph.
+        '''
+
+        if self.__meta is None:
+            self.__meta = dict(zip(_META_TITLES, self.__values))
+            self.__values = None
+        return self.__meta
+
+    @meta.setter
+    def meta(self, meta_dict):
+        self.__values = None
+        self.__meta = meta_dict
+
+    def __reduce__(self):
+        # Only the font headers the glyph reads are pickled, and the bitmap
+        # hex data is pickled as bytes
+        headers = _glyph_font_headers(self.font)
+        if self.__values is None:
+            return (_unpickle_glyph_meta, (self.__class__, self.__meta, headers))
+        return (_unpickle_glyph, (self.__class__, self.__values[:-1]) + (len(self.__values[-1]),) + _pack_hexdata(self.__values[-1]) + (headers,))
+
+    def getmeta(self, key):
+        '''
+        Get an item of the meta information of the glyph (`None` if it does not exist), without building `.meta`.
+        '''
+
+        if self.__values is not None:
+            i = _META_INDEX.get(key)
+            return None if i is None else self.__values[i]
+        return self.__meta.get(key)
+
     def __str__(self):
         '''
         Gets a human-readable (multi-line) `str` representation of the `Glyph` object.
@@ -642,7 +2597,7 @@ class Glyph(object):
         https://font.tomchen.org/bdfparser_py/glyph#cp
         '''
 
-        return self.meta['codepoint']
+        return self.getmeta('codepoint')
 
     def chr(self):
         '''
@@ -660,6 +2615,22 @@ class Glyph(object):
         https://font.tomchen.org/bdfparser_py/glyph#draw
         '''
 
+        cache = None
+        if self.__values is not None and self.font is not None:
+            cache = self.font.bitmapcache
+        if cache is not None:
+            # the glyph name tells unencoded glyphs (codepoint -1) apart
+            if mode == 0:
+                fh = self.font.headers
+                key = (self.__values[1], self.__values[0], mode,
+                       (fh['fbbx'], fh['fbby'], fh['fbbxoff'], fh['fbbyoff']))
+            else:
+                key = (self.__values[1], self.__values[0], mode,
+                       None if bb is None else tuple(bb))
+            retbitmap = cache.get(key, self.__values)
+            if retbitmap is not None:
+                return retbitmap
+
         if mode == 0:
             retbitmap = self.__draw_fbb()
         elif mode == 1:
@@ -671,33 +2642,33 @@ class Glyph(object):
         elif mode == -1 and bb is None:
             raise Exception(
                 'Parameter bb in draw() method must be set when mode=-1')
+        if cache is not None:
+            cache.put(key, self.__values, retbitmap)
         return retbitmap
 
     def __draw_user_specified(self, fbb):
-        bbxoff = self.meta.get('bbxoff')
-        bbyoff = self.meta.get('bbyoff')
+        bbxoff = self.getmeta('bbxoff')
+        bbyoff = self.getmeta('bbyoff')
         (fbbx, fbby, fbbxoff, fbbyoff) = fbb
         bitmap = self.__draw_bb()
         return bitmap.crop(fbbx, fbby, - bbxoff + fbbxoff, - bbyoff + fbbyoff)
 
     def __draw_original(self):
-        return Bitmap([bin(int(h, 16))[2:].zfill(len(h) * 4) if h else '' for h in self.meta.get('hexdata')])
+        return Bitmap._fromhex(self.getmeta('hexdata'))
 
     def __draw_bb(self):
-        bbw = self.meta.get('bbw')
-        bbh = self.meta.get('bbh')
-        bitmap = self.__draw_original()
-        bindata = bitmap.bindata
-        l = len(bindata)
+        bbw = self.getmeta('bbw')
+        bbh = self.getmeta('bbh')
+        hexdata = self.getmeta('hexdata')
+        l = len(hexdata)
         if l != bbh:
             raise Exception(
-                "Glyph \"" + str(self.meta.get('glyphname')) + "\" (codepoint " + str(self.meta.get(
+                "Glyph \"" + str(self.getmeta('glyphname')) + "\" (codepoint " + str(self.getmeta(
                     'codepoint')) + ")'s bbh, " + str(bbh) + ", does not match its hexdata line count, " + str(l)
             )
             # Use old style for Python 3.5 support. For 3.6+:
-            # f"Glyph \"{str(self.meta.get('glyphname'))}\" (codepoint {str(self.meta.get('codepoint'))})'s bbh, {str(bbh)}, does not match its hexdata line count, {str(l)}"
-        bitmap.bindata = [b[0:bbw] for b in bindata]
-        return bitmap
+            # f"Glyph \"{str(self.getmeta('glyphname'))}\" (codepoint {str(self.getmeta('codepoint'))})'s bbh, {str(bbh)}, does not match its hexdata line count, {str(l)}"
+        return Bitmap._fromhex(hexdata, bbw)
 
     def __draw_fbb(self):
         fh = self.font.headers
@@ -710,8 +2681,8 @@ class Glyph(object):
         https://font.tomchen.org/bdfparser_py/glyph#origin
         '''
 
-        bbxoff = self.meta.get('bbxoff')
-        bbyoff = self.meta.get('bbyoff')
+        bbxoff = self.getmeta('bbxoff')
+        bbyoff = self.getmeta('bbyoff')
         if mode == 0:
             fh = self.font.headers
             ret = (fh['fbbxoff'], fh['fbbyoff'])
@@ -731,6 +2702,8 @@ class Bitmap(object):
     '''
     `Bitmap` object
 
+    Cropping, overlaying and concatenating work on rows stored as `int` bitmasks (with another bitmask per row for `'2'` pixels), which `.bindata` is only built from when it is used.
+
     https://font.tomchen.org/bdfparser_py/bitmap
     '''
 
@@ -743,6 +2716,80 @@ class Bitmap(object):
 
         self.bindata = bin_bitmap_list
 
+    @property
+    def bindata(self):
+        '''
+        The binary bitmap data, a `list` of `str`s of `'0'`s, `'1'`s and `'2'`s, one per row.
+        '''
+
+        if self.__bindata is None:
+            # built from the bitmasks, which are then dropped as the list may
+            # be changed in place
+            self.__bindata = _planes_bindata(*self.__planes)
+            self.__planes = None
+        return self.__bindata
+
+    @bindata.setter
+    def bindata(self, bin_bitmap_list):
+        self.__bindata = bin_bitmap_list
+        self.__planes = None
+
+    @classmethod
+    def _fromplanes(cls, planes):
+        bitmap = cls.__new__(cls)
+        bitmap.__setplanes(planes)
+        return bitmap
+
+    @classmethod
+    def _fromhex(cls, hexdata, w=None):
+        # Bitmap of BDF bitmap hex rows, cut to `w` pixels
+        hexw = len(hexdata[0]) if hexdata else 0
+        if hexw and all(len(h) == hexw for h in hexdata):
+            rows = [int(h, 16) for h in hexdata]
+            hexw *= 4
+            if w is not None and w < hexw:
+                rows = [row >> (hexw - w) for row in rows]
+                hexw = w
+            return cls._fromplanes((hexw, rows, None))
+        bindata = [bin(int(h, 16))[2:].zfill(len(h) * 4)
+                   if h else '' for h in hexdata]
+        if w is not None:
+            bindata = [b[0:w] for b in bindata]
+        return cls(bindata)
+
+    @classmethod
+    def frombytes(cls, data, width, height, stride=None):
+        '''
+        Get a `Bitmap` object from packed 1-bit-per-pixel data (`bytes`, `bytearray`, `memoryview`...) of `height` rows of `stride` bytes (by default the fewest bytes holding `width` pixels), the most significant bit first and a set bit for each `'1'`, as BDF bitmaps, framebuffers and PIL Image mode '1' with the `'1;I'` raw mode.
+        '''
+
+        n = (width + 7) // 8
+        if stride is None:
+            stride = n
+        if stride < n:
+            raise Exception("The stride of the bitmap data is too small")
+        data = memoryview(data).cast('B')
+        if len(data) < stride * height:
+            raise Exception("The bitmap data is too short")
+        if stride == 0:
+            return cls._fromplanes((width, [0] * height, None))
+        shift = stride * 8 - width
+        return cls._fromplanes((width, [int.from_bytes(data[i:i + stride], 'big') >> shift
+                                        for i in range(0, stride * height, stride)], None))
+
+    def __getplanes(self):
+        if self.__planes is not None:
+            return self.__planes
+        return _bindata_planes(self.__bindata)
+
+    def __setplanes(self, planes):
+        self.__planes = planes
+        self.__bindata = None
+
+    def __assign(self, bitmap):
+        self.__planes = bitmap.__planes
+        self.__bindata = bitmap.__bindata
+
     def __str__(self):
         '''
         Gets a human-readable (multi-line) `str` representation of the `Bitmap` object.
@@ -761,6 +2808,13 @@ class Bitmap(object):
 
         return 'Bitmap([\'' + '\',\n        \''.join(self.bindata) + '\'])'
 
+    def __reduce__(self):
+        # Bitmaps of '0's and '1's are pickled with 1 bit per pixel
+        packed = _pack_bindata(self.bindata)
+        if packed is None:
+            return (self.__class__, (list(self.bindata),))
+        return (_unpickle_bitmap, (self.__class__,) + packed)
+
     def width(self):
         '''
         Get the width of the bitmap.
@@ -768,6 +2822,8 @@ class Bitmap(object):
         https://font.tomchen.org/bdfparser_py/bitmap#width
         '''
 
+        if self.__planes is not None:
+            return self.__planes[0]
         return len(self.bindata[0])
 
     def height(self):
@@ -777,6 +2833,8 @@ class Bitmap(object):
         https://font.tomchen.org/bdfparser_py/bitmap#height
         '''
 
+        if self.__planes is not None:
+            return len(self.__planes[1])
         return len(self.bindata)
 
     def clone(self):
@@ -786,6 +2844,8 @@ class Bitmap(object):
         https://font.tomchen.org/bdfparser_py/bitmap#clone
         '''
 
+        if self.__planes is not None:
+            return self.__class__._fromplanes(self.__planes)
         bindata = [l[:] for l in self.bindata]  # 2D list deep copy
         return self.__class__(bindata)
 
@@ -861,7 +2921,11 @@ class Bitmap(object):
         https://font.tomchen.org/bdfparser_py/bitmap#crop
         '''
 
-        self.bindata = self.__crop_bitmap(self.bindata, w, h, xoff, yoff)
+        planes = self.__getplanes()
+        if planes is None:
+            self.bindata = self.__crop_bitmap(self.bindata, w, h, xoff, yoff)
+        else:
+            self.__setplanes(_planes_crop(planes, w, h, xoff, yoff))
         return self
 
     def overlay(self, bitmap):
@@ -871,17 +2935,89 @@ class Bitmap(object):
         https://font.tomchen.org/bdfparser_py/bitmap#overlay
         '''
 
-        bindata_a = self.bindata  # no mutation, do not need deep copy
-        bindata_b = bitmap.bindata
-        if len(bindata_a) != len(bindata_b):
+        if self.height() != bitmap.height():
             warnings.warn("the bitmaps to overlay have different height")
-        if len(bindata_a[0]) != len(bindata_b[0]):
+        if self.width() != bitmap.width():
             warnings.warn("the bitmaps to overlay have different width")
+        planes_a = self.__getplanes()
+        planes_b = bitmap.__getplanes()
+        if planes_a is not None and planes_b is not None:
+            # b over a, left aligned
+            w = min(planes_a[0], planes_b[0])
+            self.__setplanes(_planes_over(w, _planes_shift(planes_a, w - planes_a[0]),
+                                          _planes_shift(planes_b, w - planes_b[0])))
+            return self
+        bindata_a = self.bindata  # no mutation, do not need deep copy
+        bindata_b = bitmap.bindata
         # b over a
         self.bindata = [''.join(str(int(b) or int(a)) for a, b in zip(
             la, lb)) for la, lb in zip(bindata_a, bindata_b)]
         return self
 
+    def blit(self, bitmap, x=0, y=0, op='or'):
+        '''
+        Draw another bitmap onto the bitmap, which keeps its size: its top left corner goes `x` pixels right of and `y` pixels down from the bitmap's top left corner, and what falls outside the bitmap is clipped.
+
+        `op` is how the pixels are combined: `'or'` (the other bitmap's `'1'`s and `'2'`s are drawn over the bitmap, as `.overlay()`), `'replace'` (all its pixels are), `'xor'` (its `'1'`s and `'2'`s are drawn where the bitmap has `'0'`s and clear the other pixels), `'and'` (the bitmap's pixels are only kept where it has `'1'`s or `'2'`s) or `'andnot'` (they are cleared there). Only the rows drawn onto are changed.
+        '''
+
+        if op not in _BLIT_OPS:
+            raise Exception("Unknown blit operation: " + str(op))
+        if self.height() == 0 or bitmap.height() == 0:
+            return self
+        dst = self.__getplanes()
+        src = bitmap.__getplanes()
+        if src is None:
+            # e.g. an `ArrayBitmap`, which keeps no planes
+            src = _bindata_planes(bitmap.bindata)
+        if dst is None or src is None:
+            raise Exception(
+                "Only bitmaps of '0's, '1's and '2's in rows of the same width can be blitted")
+        (w, ones, twos) = dst
+        (srcw, srcones, srctwos) = src
+        clip = _blit_clip(w, len(ones), srcw, len(srcones), x, y)
+        if clip is None:
+            return self
+        (left, top, right, bottom) = clip
+        area = ((1 << (right - left)) - 1) << (w - right)
+        shift = w - x - srcw
+        ones = list(ones)
+        if twos is not None or srctwos is not None:
+            twos = [0] * len(ones) if twos is None else list(twos)
+        for i in range(top, bottom):
+            a1 = srcones[i - y]
+            a2 = 0 if srctwos is None else srctwos[i - y]
+            if shift >= 0:
+                a1 = (a1 << shift) & area
+                a2 = (a2 << shift) & area
+            else:
+                a1 = (a1 >> -shift) & area
+                a2 = (a2 >> -shift) & area
+            ink = a1 | a2
+            d1 = ones[i]
+            d2 = 0 if twos is None else twos[i]
+            if op == 'or':
+                d1 = a1 | (d1 & ~ink)
+                d2 = a2 | (d2 & ~ink)
+            elif op == 'replace':
+                d1 = a1 | (d1 & ~area)
+                d2 = a2 | (d2 & ~area)
+            elif op == 'xor':
+                dink = d1 | d2
+                d1 = (d1 & ~ink) | (a1 & ~dink)
+                d2 = (d2 & ~ink) | (a2 & ~dink)
+            elif op == 'and':
+                d1 &= ~area | ink
+                d2 &= ~area | ink
+            else:  # 'andnot'
+                d1 &= ~ink
+                d2 &= ~ink
+            ones[i] = d1
+            if twos is not None:
+                twos[i] = d2
+        self.__setplanes((w, ones, twos))
+        return self
+
     @classmethod
     def concatall(cls, bitmaplist, direction=1, align=1, offsetlist=None):
         '''
@@ -890,6 +3026,12 @@ class Bitmap(object):
         https://font.tomchen.org/bdfparser_py/bitmap#bitmapconcatall
         '''
 
+        planeslist = [bitmap.__getplanes() for bitmap in bitmaplist]
+        if all(planes is not None for planes in planeslist):
+            (w, h, positions, order) = _concat_layout(
+                [(planes[0], len(planes[1])) for planes in planeslist], direction, align, offsetlist)
+            return cls._fromplanes(_planes_compose(planeslist, w, h, positions, order))
+
         if direction > 0:  # horizontal
 
             maxsize = max(bitmap.height() for bitmap in bitmaplist)
@@ -965,8 +3107,8 @@ class Bitmap(object):
         https://font.tomchen.org/bdfparser_py/bitmap#concat
         '''
 
-        self.bindata = self.__class__.concatall(
-            [self, bitmap], direction, align, [offset]).bindata
+        self.__assign(self.__class__.concatall(
+            [self, bitmap], direction, align, [offset]))
         return self
 
     @classmethod
@@ -1025,13 +3167,19 @@ class Bitmap(object):
         https://font.tomchen.org/bdfparser_py/bitmap#shadow
         '''
 
-        bitmap_shadow = self.clone()
+        planes = self.__getplanes()
+        if planes is None:
+            bitmap_shadow = self.clone()
+            bitmap_shadow.bindata = [l.replace('1', '2')
+                                     for l in bitmap_shadow.bindata]
+        else:
+            (_, ones, twos) = planes
+            bitmap_shadow = self.__class__._fromplanes((planes[0], [0] * len(ones), ones if twos is None else [
+                one | two for one, two in zip(ones, twos)]))
         w = self.width()
         h = self.height()
         w += abs(xoff)
         h += abs(yoff)
-        bitmap_shadow.bindata = [l.replace('1', '2')
-                                 for l in bitmap_shadow.bindata]
 
         if xoff > 0:
             resized_xoff = 0
@@ -1050,7 +3198,7 @@ class Bitmap(object):
         self.crop(w, h, resized_xoff, resized_yoff)
         bitmap_shadow.crop(w, h, shadow_xoff, shadow_yoff)
         bitmap_shadow.overlay(self)
-        self.bindata = bitmap_shadow.bindata
+        self.__assign(bitmap_shadow)
         return self
 
     def glow(self, mode=0):
@@ -1118,13 +3266,41 @@ class Bitmap(object):
             return [[int(p) for p in l] for l in self.bindata]
         elif datatype == 3:
             return [int(p) for l in self.bindata for p in l]
-        elif datatype == 4:
+        planes = self.__planes
+        if datatype in (4, 5) and planes is not None and planes[2] is None:
+            if datatype == 4:
+                f = '0' + str(-1 * planes[0] // 4 * -1) + 'x'
+                return [format(row, f) for row in planes[1]]
+            return list(planes[1])
+        if datatype == 4:
             # if there are '2's, it will throw error
             return [hex(int(l, 2))[2:].zfill(-1 * self.width() // 4 * -1) for l in self.bindata]
         elif datatype == 5:
             # if there are '2's, it will throw error
             return [int(l, 2) for l in self.bindata]
 
+    def tobuffer(self, stride=None):
+        '''
+        Get the bitmap's data packed as in `Bitmap.frombytes()`, as `bytes` of rows of `stride` bytes (by default the fewest bytes holding the bitmap's width), with a set bit for each `'1'` or `'2'`.
+        '''
+
+        planes = self.__getplanes()
+        if planes is None:
+            if self.height() == 0:
+                return b''
+            raise Exception(
+                "Only bitmaps of '0's, '1's and '2's in rows of the same width can be packed")
+        (w, ones, twos) = planes
+        n = (w + 7) // 8
+        if stride is None:
+            stride = n
+        if stride < n:
+            raise Exception("The stride of the bitmap data is too small")
+        if twos is not None:
+            ones = [one | two for one, two in zip(ones, twos)]
+        shift = stride * 8 - w
+        return b''.join((one << shift).to_bytes(stride, 'big') for one in ones)
+
     def tobytes(self, mode='RGB', bytesdict=None):
         '''
         Get the bitmap's data as `bytes` to be used with Pillow library's `Image.frombytes(mode, size, data)`.
@@ -1140,6 +3316,26 @@ class Bitmap(object):
                     1: 0,
                     2: 0,
                 }
+
+            planes = self.__getplanes()
+            if planes is not None and all(bytesdict.get(p) in (0, 1) for p in (0, 1, 2)):
+                # whole rows at once, padding pixels being '0's
+                (w, ones, twos) = planes
+                pad = -w % 8
+                full = (1 << (w + pad)) - 1
+                ret = []
+                for i, one in enumerate(ones):
+                    two = 0 if twos is None else twos[i] << pad
+                    one <<= pad
+                    row = 0
+                    if bytesdict[0]:
+                        row |= full & ~(one | two)
+                    if bytesdict[1]:
+                        row |= one
+                    if bytesdict[2]:
+                        row |= two
+                    ret.append(row.to_bytes((w + pad) // 8, 'big'))
+                return b''.join(ret)
             # For PIL Image mode '1', if the line bit count is not multiples of 8, it must be padded with 0 to the right
             bits = []
             w = self.width()
@@ -1190,3 +3386,334 @@ class Bitmap(object):
                 for p in l:
                     retbytes += bytesdict[int(p)]
             return retbytes
+
+
+def _numpy():
+    # Import NumPy for `ArrayBitmap` on first use, not with the package
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(
+                "ArrayBitmap requires NumPy (pip install bdfparser[numpy])")
+        _np = numpy
+    return _np
+
+
+class ArrayBitmap(Bitmap):
+    '''
+    `Bitmap` object backed by a 2D `numpy.uint8` array of the pixel values, for which NumPy is needed (`pip install bdfparser[numpy]`); without NumPy, creating one raises `ImportError`
+
+    Cropping, overlaying, concatenating, enlarging, replacing and the effects are array operations. `.todata(2)` and `.todata(3)` return the array and a flat view of it instead of `list`s, and `.toarray()` returns the array itself.
+    '''
+
+    def __init__(self, data):
+        '''
+        Initialize an `ArrayBitmap` object from a 2D array (not copied if it is already a `numpy.uint8` array), a `Bitmap` object or binary bitmap data (`list` of `str`s).
+        '''
+
+        _numpy()
+        Bitmap.bindata.fset(self, None)  # `Bitmap`'s own storage is not used
+        if isinstance(data, Bitmap):
+            data = data.toarray() if isinstance(
+                data, ArrayBitmap) else data.bindata
+        if isinstance(data, list) and (not data or isinstance(data[0], str)):
+            data = self.__bindata_array(data)
+        self.__setarray(data)
+
+    @property
+    def bindata(self):
+        '''
+        The binary bitmap data, a `list` of `str`s of `'0'`s, `'1'`s and `'2'`s, one per row.
+        '''
+
+        # built from the array and kept until the array is changed, and
+        # changes made to the list in place go to the array
+        a = self.__getarray()
+        source = a.tobytes()
+        if self.__bindata is None or source != self.__bindata_source:
+            w = a.shape[1]
+            data = (a + 48).tobytes().decode('latin-1')
+            self.__bindata = [data[i:i + w] for i in range(0, len(data), w)] if w else [''] * a.shape[0]
+            self.__bindata_rows = tuple(self.__bindata)
+            self.__bindata_source = source
+        return self.__bindata
+
+    @bindata.setter
+    def bindata(self, bin_bitmap_list):
+        self.__setarray(self.__bindata_array(bin_bitmap_list))
+
+    @staticmethod
+    def __bindata_array(bindata):
+        if not bindata:
+            return _np.zeros((0, 0), _np.uint8)
+        w = len(bindata[0])
+        if any(len(row) != w for row in bindata):
+            raise Exception("The rows of an ArrayBitmap must have the same length")
+        a = _np.frombuffer(''.join(bindata).encode('latin-1'),
+                           _np.uint8).reshape(len(bindata), w) - 48
+        if (a > 9).any():
+            raise Exception("The pixels of an ArrayBitmap must be digits")
+        return a
+
+    def __getarray(self):
+        if self.__bindata is not None and tuple(self.__bindata) != self.__bindata_rows:
+            # the list of `.bindata` was changed in place
+            self.__setarray(self.__bindata_array(self.__bindata))
+        return self.__array
+
+    def __setarray(self, a):
+        a = _np.asarray(a, dtype=_np.uint8)
+        if a.ndim != 2:
+            raise Exception("The array of an ArrayBitmap must be 2D")
+        self.__array = a
+        self.__bindata = None
+
+    @classmethod
+    def __asarray(cls, bitmap):
+        if isinstance(bitmap, ArrayBitmap):
+            return bitmap.__getarray()
+        return cls.__bindata_array(bitmap.bindata)
+
+    def toarray(self):
+        '''
+        Get the bitmap's 2D `numpy.uint8` array of pixel values (not a copy: changes made to it change the bitmap).
+        '''
+
+        return self.__getarray()
+
+    def width(self):
+        return self.__getarray().shape[1]
+
+    def height(self):
+        return self.__getarray().shape[0]
+
+    def clone(self):
+        return self.__class__(self.__getarray().copy())
+
+    @staticmethod
+    def __crop_array(a, w, h, xoff=0, yoff=0):
+        ret = _np.zeros((h, w), _np.uint8)
+        (l, width) = a.shape
+        top = l - yoff - h  # source row of the first row
+        r0 = max(0, -top)
+        r1 = min(h, l - top)
+        c0 = max(0, -xoff)
+        c1 = min(w, width - xoff)
+        if r0 < r1 and c0 < c1:
+            ret[r0:r1, c0:c1] = a[top + r0:top + r1, xoff + c0:xoff + c1]
+        return ret
+
+    def crop(self, w, h, xoff=0, yoff=0):
+        self.__setarray(self.__crop_array(
+            self.__getarray(), w, h, xoff, yoff))
+        return self
+
+    def overlay(self, bitmap):
+        a = self.__getarray()
+        b = self.__asarray(bitmap)
+        if a.shape[0] != b.shape[0]:
+            warnings.warn("the bitmaps to overlay have different height")
+        if a.shape[1] != b.shape[1]:
+            warnings.warn("the bitmaps to overlay have different width")
+        h = min(a.shape[0], b.shape[0])
+        w = min(a.shape[1], b.shape[1])
+        a = a[:h, :w]
+        b = b[:h, :w]
+        # b over a
+        self.__setarray(_np.where(b != 0, b, a))
+        return self
+
+    def blit(self, bitmap, x=0, y=0, op='or'):
+        if op not in _BLIT_OPS:
+            raise Exception("Unknown blit operation: " + str(op))
+        a = self.toarray()
+        b = self.__asarray(bitmap)
+        clip = _blit_clip(a.shape[1], a.shape[0],
+                          b.shape[1], b.shape[0], x, y)
+        if clip is None:
+            return self
+        (left, top, right, bottom) = clip
+        # views of the drawn area
+        d = a[top:bottom, left:right]
+        b = b[top - y:bottom - y, left - x:right - x]
+        ink = b != 0
+        if op == 'or':
+            _np.copyto(d, b, where=ink)
+        elif op == 'replace':
+            d[...] = b
+        elif op == 'xor':
+            dink = d != 0
+            _np.copyto(d, b, where=ink & ~dink)
+            d[ink & dink] = 0
+        elif op == 'and':
+            d[~ink] = 0
+        else:  # 'andnot'
+            d[ink] = 0
+        return self
+
+    @classmethod
+    def concatall(cls, bitmaplist, direction=1, align=1, offsetlist=None):
+        _numpy()
+        arrays = [cls.__asarray(bitmap) for bitmap in bitmaplist]
+        (w, h, positions, order) = _concat_layout(
+            [(a.shape[1], a.shape[0]) for a in arrays], direction, align, offsetlist)
+        ret = _np.zeros((h, w), _np.uint8)
+        for i in order:
+            a = arrays[i]
+            (x, y) = positions[i]
+            _np.copyto(ret[y:y + a.shape[0], x:x + a.shape[1]], a, where=a != 0)
+        return cls(ret)
+
+    def concat(self, bitmap, direction=1, align=1, offset=0):
+        self.__setarray(self.__class__.concatall(
+            [self, bitmap], direction, align, [offset]).__getarray())
+        return self
+
+    @staticmethod
+    def __enlarge_array(a, x=1, y=1):
+        if x > 1:
+            a = _np.repeat(a, x, axis=1)
+        if y > 1:
+            a = _np.repeat(a, y, axis=0)
+        return a
+
+    def enlarge(self, x=1, y=1):
+        self.__setarray(self.__enlarge_array(self.__getarray(), x, y))
+        return self
+
+    def __mul__(self, mul):
+        if isinstance(mul, int):
+            x = y = mul
+        else:  # isinstance(mul, tuple)
+            (x, y) = mul
+        return self.__class__(self.__enlarge_array(self.__getarray(), x, y))
+
+    def replace(self, substr, newsubstr):
+        if isinstance(substr, int):
+            substr = str(substr)
+        if isinstance(newsubstr, int):
+            newsubstr = str(newsubstr)
+        if len(substr) == 1 and len(newsubstr) == 1 and substr.isdigit() and newsubstr.isdigit():
+            a = self.__getarray()
+            self.__setarray(_np.where(a == int(substr), int(newsubstr), a))
+            return self
+        return Bitmap.replace(self, substr, newsubstr)
+
+    def shadow(self, xoff=1, yoff=-1):
+        a = self.__getarray()
+        (h, w) = a.shape
+        ret = _np.zeros((h + abs(yoff), w + abs(xoff)), _np.uint8)
+        # as `Bitmap.shadow()`: the shadow, then the bitmap over it
+        sx = max(xoff, 0)
+        sy = max(-yoff, 0)
+        ret[sy:sy + h, sx:sx + w] = _np.where(a == 1, 2, a)
+        x = max(-xoff, 0)
+        y = max(yoff, 0)
+        _np.copyto(ret[y:y + h, x:x + w], a, where=a != 0)
+        self.__setarray(ret)
+        return self
+
+    def glow(self, mode=0):
+        a = self.__crop_array(self.__getarray(), self.width() + 2,
+                              self.height() + 2, -1, -1)
+        ones = a == 1
+        around = _np.zeros(a.shape, bool)
+        around[:, :-1] |= ones[:, 1:]
+        around[:, 1:] |= ones[:, :-1]
+        around[:-1, :] |= ones[1:, :]
+        around[1:, :] |= ones[:-1, :]
+        if mode == 1:
+            around[:-1, :-1] |= ones[1:, 1:]
+            around[:-1, 1:] |= ones[1:, :-1]
+            around[1:, :-1] |= ones[:-1, 1:]
+            around[1:, 1:] |= ones[:-1, :-1]
+        self.__setarray(_np.where((a == 0) & around, 2, a))
+        return self
+
+    @classmethod
+    def frombytes(cls, data, width, height, stride=None):
+        _numpy()
+        n = (width + 7) // 8
+        if stride is None:
+            stride = n
+        if stride < n:
+            raise Exception("The stride of the bitmap data is too small")
+        a = _np.frombuffer(data, _np.uint8)
+        if len(a) < stride * height:
+            raise Exception("The bitmap data is too short")
+        a = a[:stride * height].reshape(height, stride)
+        return cls(_np.unpackbits(a, axis=1)[:, :width])
+
+    def tobuffer(self, stride=None):
+        a = self.__getarray()
+        n = (a.shape[1] + 7) // 8
+        if stride is None:
+            stride = n
+        if stride < n:
+            raise Exception("The stride of the bitmap data is too small")
+        packed = _np.packbits(a != 0, axis=1)
+        if stride > n:
+            packed = _np.pad(packed, ((0, 0), (0, stride - n)))
+        return packed.tobytes()
+
+    def todata(self, datatype=1):
+        if datatype == 2:
+            return self.toarray()
+        elif datatype == 3:
+            return self.toarray().reshape(-1)
+        return Bitmap.todata(self, datatype)
+
+    def tobytes(self, mode='RGB', bytesdict=None):
+        a = self.__getarray()
+
+        if mode == '1':
+
+            if bytesdict == None:
+                bytesdict = {
+                    0: 1,
+                    1: 0,
+                    2: 0,
+                }
+            # For PIL Image mode '1', if the line bit count is not multiples of 8, it must be padded with 0 to the right
+            mod = a.shape[1] % 8
+            if mod != 0:
+                a = _np.pad(a, ((0, 0), (0, 8 - mod)))
+            return _np.packbits(self.__lookup(bytesdict)[a], axis=1).tobytes()
+
+        if mode == 'L':
+            bytesdict = bytesdict or {
+                0: b'\xff',
+                1: b'\x00',
+                2: b'\x7f',
+            }
+        elif mode == 'RGBA':
+            bytesdict = bytesdict or {
+                0: b'\xff\xff\xff\x00',
+                1: b'\x00\x00\x00\xff',
+                2: b'\xff\x00\x00\xff',
+            }
+        else:
+            if mode != 'RGB':
+                warnings.warn("Unknown mode, fallback to RGB")
+            bytesdict = bytesdict or {
+                0: b'\xff\xff\xff',
+                1: b'\x00\x00\x00',
+                2: b'\xff\x00\x00',
+            }
+        return self.__lookup(bytesdict)[a].tobytes()
+
+    @staticmethod
+    def __lookup(bytesdict):
+        # pixel value -> `int` or `bytes` table
+        size = max(bytesdict) + 1
+        values = list(bytesdict.values())
+        if isinstance(values[0], int):
+            table = _np.zeros(size, _np.uint8)
+        else:
+            table = _np.zeros((size, len(values[0])), _np.uint8)
+        for key, value in bytesdict.items():
+            table[key] = value if isinstance(value, int) else _np.frombuffer(value, _np.uint8)
+        return table
+
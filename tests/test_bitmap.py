@@ -1,5 +1,10 @@
+import os
+import pickle
+import subprocess
+import sys
 import unittest
-from bdfparser import Font, Bitmap
+import warnings
+from bdfparser import Font, Bitmap, ArrayBitmap
 from .info import specfont_path, bitmap_qr2_bindata, bitmap_qr3_bindata
 
 
@@ -35,12 +40,56 @@ class TestBitmap(unittest.TestCase):
         self.assertEqual(self.bitmap_qr.height(), 6)
         self.assertEqual(self.bitmap_qr2.height(), 5)
 
+    def test_pickle(self):
+        for bitmap in (self.bitmap_qr, self.bitmap_qr2, Bitmap([]), Bitmap(['', ''])):
+            self.assertEqual(pickle.loads(pickle.dumps(bitmap)).bindata,
+                             bitmap.bindata)
+        bitmap = self.font.draw('j\'' * 20)
+        data = pickle.dumps(bitmap)
+        self.assertEqual(pickle.loads(data).bindata, bitmap.bindata)
+        self.assertLess(len(data), len(pickle.dumps(bitmap.bindata)) / 4)
+
+    def test_frombytes_tobuffer(self):
+        self.assertEqual(self.bitmap_qr.tobuffer(),
+                         b'\x70\x70\x70\x60\xe0\xc0')
+        self.assertEqual(self.bitmap_qr2.tobuffer(),
+                         b'\x70\x78\x68\xa0\x40')
+        self.assertEqual(self.bitmap_qr2.tobuffer(2),
+                         b'\x70\x00\x78\x00\x68\x00\xa0\x00\x40\x00')
+        self.assertEqual(self.bitmap_qr2.tobuffer(),
+                         self.bitmap_qr2.tobytes('1', {0: 0, 1: 1, 2: 1}))
+        self.assertEqual(Bitmap.frombytes(b'\x70\x00\x78\x00\x68\x00\xa0\x00\x40\x00', 5, 5, 2).bindata,
+                         ['01110', '01111', '01101', '10100', '01000'])
+        self.assertEqual(Bitmap.frombytes(bytearray(self.bitmap_qr.tobuffer()), 8, 6).bindata,
+                         self.bitmap_qr.bindata)
+        with self.assertRaises(Exception):
+            Bitmap.frombytes(b'\x70', 8, 2)
+        with self.assertRaises(Exception):
+            self.bitmap_qr2.tobuffer(0)
+
     def test_clone(self):
         self.assertNotEqual(self.bitmap_qr.clone(),
                             self.bitmap_qr)
         self.assertEqual(self.bitmap_qr.clone().bindata,
                          self.bitmap_qr.bindata)
 
+    def test_import_on_first_use(self):
+        code = 'import sys, bdfparser; print("numpy" in sys.modules); bdfparser.ArrayBitmap([]); print("numpy" in sys.modules)'
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        self.assertEqual(subprocess.check_output([sys.executable, '-c', code], env=env).split(),
+                         [b'False', b'True'])
+
+    def test_bindata_in_place(self):
+        bitmap = self.bitmap_qr2.crop(6, 5)
+        bitmap.bindata[0] = '111111'
+        self.assertEqual(bitmap.crop(7, 5).bindata, ['1111110',
+                                                     '0211200',
+                                                     '0110200',
+                                                     '1020000',
+                                                     '0100000'])
+        self.assertEqual(self.bitmap_qr.crop(8, 3).todata(5),
+                         [0b01100000, 0b11100000, 0b11000000])
+
 
 class TestBitmapAlter(unittest.TestCase):
 
@@ -74,6 +123,11 @@ class TestBitmapAlter(unittest.TestCase):
                                                                       '000000',
                                                                       '000000'])
 
+    def test_crop_other_chars(self):
+        self.assertEqual(Bitmap(['ab', 'cd']).crop(3, 3, -1).bindata, ['000',
+                                                                       '0ab',
+                                                                       '0cd'])
+
     def test_replace(self):
         self.assertEqual(self.bitmap_qr2.replace('2', '3').bindata, ['01110',
                                                                      '03113',
@@ -103,6 +157,57 @@ class TestBitmapOverlay(unittest.TestCase):
                         '11000000'])
 
 
+class TestBitmapBlit(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.bitmap_qr2 = Bitmap(bitmap_qr2_bindata)
+        self.canvas = Bitmap(['1100000',
+                              '1100000',
+                              '0000000',
+                              '0000000'])
+
+    def test_blit(self):
+        canvas = self.canvas.clone()
+        self.assertIs(canvas.blit(self.bitmap_qr2, 1, 1), canvas)
+        self.assertEqual(canvas.bindata, ['1100000',
+                                          '1111100',
+                                          '0021120',
+                                          '0011020'])
+        self.assertEqual(self.canvas.clone().blit(self.bitmap_qr2, -3, 2).bindata, ['1100000',
+                                                                                   '1100000',
+                                                                                   '1000000',
+                                                                                   '1200000'])
+        self.assertEqual(self.canvas.clone().blit(self.bitmap_qr2, 7, 0).bindata,
+                         self.canvas.bindata)
+
+    def test_blit_ops(self):
+        self.assertEqual(self.canvas.clone().blit(self.bitmap_qr2, 0, 0, 'replace').bindata, ['0111000',
+                                                                                             '0211200',
+                                                                                             '0110200',
+                                                                                             '1020000'])
+        self.assertEqual(self.canvas.clone().blit(self.bitmap_qr2, 0, 0, 'xor').bindata, ['1011000',
+                                                                                         '1011200',
+                                                                                         '0110200',
+                                                                                         '1020000'])
+        self.assertEqual(self.canvas.clone().blit(self.bitmap_qr2, 0, 0, 'and').bindata, ['0100000',
+                                                                                         '0100000',
+                                                                                         '0000000',
+                                                                                         '0000000'])
+        self.assertEqual(self.canvas.clone().blit(self.bitmap_qr2, 0, 0, 'andnot').bindata, ['1000000',
+                                                                                            '1000000',
+                                                                                            '0000000',
+                                                                                            '0000000'])
+        with self.assertRaises(Exception):
+            self.canvas.blit(self.bitmap_qr2, 0, 0, 'nand')
+
+    def test_blit_shared_rows(self):
+        canvas = self.canvas.clone().crop(7, 4)
+        clone = canvas.clone()
+        canvas.blit(self.bitmap_qr2, 2, 0)
+        self.assertEqual(clone.bindata, self.canvas.bindata)
+
+
 class TestBitmapConcat(unittest.TestCase):
 
     def setUp(self):
@@ -379,6 +484,18 @@ class TestBitmapConcat(unittest.TestCase):
                                                                                                                              '0000000011100000',
                                                                                                                              '0000000011000000'])
 
+    def test_concatall_long(self):
+        bitmaps = [self.bitmap_qr, self.bitmap_qr2, self.bitmap_j] * 40
+        offsetlist = [-3, 1, -9] * 40
+        for direction in (1, 2, 0, -1):
+            for align in (0, 1):
+                ret = bitmaps[0]
+                for bitmap, offset in zip(bitmaps[1:], offsetlist):
+                    ret = Bitmap.concatall(
+                        [ret, bitmap], direction, align, [offset])
+                self.assertEqual(Bitmap.concatall(bitmaps, direction, align, offsetlist[:-1]).bindata,
+                                 ret.bindata)
+
     def test_plus(self):
         w = self.bitmap_qr.width()
         self.assertEqual((self.bitmap_qr + self.bitmap_j).bindata, ['000000000000001110000000',
@@ -634,3 +751,147 @@ class TestBitmapStrRepr(unittest.TestCase):
 
 # if __name__ == '__main__':
 #     unittest.main()
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestArrayBitmap(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(specfont_path)
+        self.bitmap_qr = self.font.glyph("'").draw(mode=2)
+        self.bitmap_qr2 = Bitmap(bitmap_qr2_bindata)
+
+    def assertSameBitmap(self, arraybitmap, bitmap):
+        self.assertIsInstance(arraybitmap, ArrayBitmap)
+        self.assertEqual(arraybitmap.bindata, bitmap.bindata)
+
+    def test_init(self):
+        a = numpy.array([[0, 1], [2, 0]], numpy.uint8)
+        self.assertIs(ArrayBitmap(a).toarray(), a)
+        self.assertEqual(ArrayBitmap(a).bindata, ['01', '20'])
+        self.assertSameBitmap(ArrayBitmap(self.bitmap_qr2), self.bitmap_qr2)
+        self.assertSameBitmap(ArrayBitmap(bitmap_qr2_bindata), self.bitmap_qr2)
+        with self.assertRaises(Exception):
+            ArrayBitmap(['01', '0'])
+
+    def test_bindata_in_place(self):
+        bitmap = ArrayBitmap(bitmap_qr2_bindata).crop(6, 5)
+        bitmap.bindata[0] = '111111'
+        self.assertEqual(bitmap.crop(6, 5).toarray()[0].tolist(), [1] * 6)
+
+    def test_toarray_after_str(self):
+        bitmap = ArrayBitmap(bitmap_qr2_bindata)
+        a = bitmap.toarray()
+        self.assertEqual(str(bitmap), str(self.bitmap_qr2))
+        self.assertIs(bitmap.toarray(), a)
+        a[0, 0] = 1
+        self.assertEqual(bitmap.bindata[0][0], '1')
+        bitmap.bindata[1] = '22222'
+        self.assertEqual(bitmap.toarray()[1].tolist(), [2] * 5)
+
+    def test_alter(self):
+        for args in ((6, 10), (6, 10, -1, -2), (3, 2, 2, 3), (2, 2, 9, 9)):
+            self.assertSameBitmap(ArrayBitmap(self.bitmap_qr).crop(*args),
+                                  self.bitmap_qr.clone().crop(*args))
+        self.assertSameBitmap(ArrayBitmap(self.bitmap_qr2).replace('2', '3'),
+                              self.bitmap_qr2.clone().replace('2', '3'))
+        self.assertSameBitmap(ArrayBitmap(self.bitmap_qr2).replace('01', '10'),
+                              self.bitmap_qr2.clone().replace('01', '10'))
+        self.assertSameBitmap(ArrayBitmap(self.bitmap_qr) * (2, 3),
+                              self.bitmap_qr * (2, 3))
+
+    def test_overlay(self):
+        bitmap_qr2 = self.bitmap_qr2.crop(self.bitmap_qr.width(),
+                                          self.bitmap_qr.height())
+        self.assertSameBitmap(ArrayBitmap(self.bitmap_qr).overlay(bitmap_qr2),
+                              self.bitmap_qr.clone().overlay(bitmap_qr2))
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.assertSameBitmap(ArrayBitmap(self.bitmap_qr).overlay(self.bitmap_qr2),
+                                  self.bitmap_qr.clone().overlay(self.bitmap_qr2))
+
+    def test_concatall(self):
+        bitmaps = [self.bitmap_qr, self.bitmap_qr2, self.bitmap_qr]
+        for direction in (1, 2, 0, -1):
+            for align in (0, 1):
+                for offsetlist in (None, [2, -7]):
+                    self.assertSameBitmap(
+                        ArrayBitmap.concatall(
+                            bitmaps, direction, align, offsetlist),
+                        Bitmap.concatall(bitmaps, direction, align, offsetlist))
+        self.assertSameBitmap(ArrayBitmap(self.bitmap_qr) + self.bitmap_qr2,
+                              self.bitmap_qr + self.bitmap_qr2)
+        self.assertSameBitmap(ArrayBitmap(self.bitmap_qr).concat(self.bitmap_qr2, -1, 0, -2),
+                              self.bitmap_qr.clone().concat(self.bitmap_qr2, -1, 0, -2))
+
+    def test_effects(self):
+        for xoff, yoff in ((1, -1), (-2, 3), (0, 0)):
+            self.assertSameBitmap(ArrayBitmap(self.bitmap_qr2).shadow(xoff, yoff),
+                                  self.bitmap_qr2.clone().shadow(xoff, yoff))
+        for mode in (0, 1):
+            self.assertSameBitmap(ArrayBitmap(self.bitmap_qr2).glow(mode),
+                                  self.bitmap_qr2.clone().glow(mode))
+
+    def test_todata(self):
+        bitmap = ArrayBitmap(self.bitmap_qr2)
+        self.assertIs(bitmap.todata(2), bitmap.toarray())
+        self.assertTrue(numpy.shares_memory(
+            bitmap.todata(3), bitmap.toarray()))
+        self.assertEqual(bitmap.todata(2).tolist(), self.bitmap_qr2.todata(2))
+        self.assertEqual(bitmap.todata(3).tolist(), self.bitmap_qr2.todata(3))
+        self.assertEqual(bitmap.todata(0), self.bitmap_qr2.todata(0))
+        self.assertEqual(ArrayBitmap(self.bitmap_qr).todata(4),
+                         self.bitmap_qr.todata(4))
+
+    def test_tobytes(self):
+        bitmap = ArrayBitmap(self.bitmap_qr2)
+        for mode in ('1', 'L', 'RGB', 'RGBA'):
+            self.assertEqual(bitmap.tobytes(mode),
+                             self.bitmap_qr2.tobytes(mode))
+        self.assertEqual(bitmap.tobytes('1', {0: 0, 1: 1, 2: 1}),
+                         self.bitmap_qr2.tobytes('1', {0: 0, 1: 1, 2: 1}))
+
+    def test_frombytes_tobuffer(self):
+        bitmap = ArrayBitmap.frombytes(self.bitmap_qr2.tobuffer(2), 5, 5, 2)
+        self.assertIsInstance(bitmap, ArrayBitmap)
+        self.assertEqual(bitmap.bindata, Bitmap.frombytes(
+            self.bitmap_qr2.tobuffer(2), 5, 5, 2).bindata)
+        for stride in (None, 3):
+            self.assertEqual(ArrayBitmap(self.bitmap_qr2).tobuffer(stride),
+                             self.bitmap_qr2.tobuffer(stride))
+
+    def test_blit(self):
+        canvas = ArrayBitmap(['0' * 12] * 7)
+        a = canvas.toarray()
+        for x, y, op in ((1, 1, 'or'), (-2, 4, 'replace'), (9, -1, 'xor'), (3, 3, 'and'), (8, 2, 'andnot')):
+            canvas.blit(self.bitmap_qr2, x, y, op)
+            self.assertIs(canvas.toarray(), a)
+        bitmap = Bitmap(['0' * 12] * 7)
+        for x, y, op in ((1, 1, 'or'), (-2, 4, 'replace'), (9, -1, 'xor'), (3, 3, 'and'), (8, 2, 'andnot')):
+            bitmap.blit(self.bitmap_qr2, x, y, op)
+        self.assertSameBitmap(canvas, bitmap)
+
+    def test_blit_mixed(self):
+        canvas = Bitmap(['0' * 12] * 7)
+        canvas.blit(ArrayBitmap(self.bitmap_qr2), 1, 1)
+        self.assertEqual(canvas.bindata, Bitmap(
+            ['0' * 12] * 7).blit(self.bitmap_qr2, 1, 1).bindata)
+
+    def test_pickle(self):
+        bitmap = pickle.loads(pickle.dumps(ArrayBitmap(self.bitmap_qr2)))
+        self.assertSameBitmap(bitmap, self.bitmap_qr2)
+
+
+@unittest.skipIf(numpy is not None, 'NumPy is installed')
+class TestArrayBitmapFallback(unittest.TestCase):
+
+    def test_fallback(self):
+        with self.assertRaises(ImportError):
+            ArrayBitmap(bitmap_qr2_bindata)
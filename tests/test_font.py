@@ -1,11 +1,49 @@
+import io
+import asyncio
+import bz2
+import copy
+import gzip
+import lzma
+import os
+import pickle
+import mmap
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
-from bdfparser import Font, Glyph
-from .info import unifont_path, glyph_a_meta, missing_glyph_meta
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from bdfparser import BitmapCache, Font, FontInfo, FontParser, FontStack, Glyph, aload_many, iterparse, probe
+from .info import unifont_path, specfont_path, glyph_a_meta, missing_glyph_meta
 
 
 # Test all `Font` attributes and methods, with Unifont
 
 
+def _draw(font, text):
+    # Runs in a worker process
+    return font.draw(text)
+
+
+def _attached_draw(name, text):
+    # Runs in a worker process
+    return Font.attach(name).draw(text).bindata
+
+
+class SameFontTestCase(unittest.TestCase):
+
+    def assertSameFont(self, font, reffont):
+        self.assertEqual(font.headers, reffont.headers)
+        self.assertEqual(font.props, reffont.props)
+        self.assertEqual(list(font.glyphs), list(reffont.glyphs))
+        for cp in reffont.glyphs:
+            self.assertEqual(font.glyphs[cp], reffont.glyphs[cp])
+
+
 class TestFontLoading(unittest.TestCase):
 
     def setUp(self):
@@ -20,6 +58,749 @@ class TestFontLoading(unittest.TestCase):
             self.font.load_file_obj(open(unifont_path)), Font)
 
 
+class TestFontLazyLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+        self.lazyfont = Font(unifont_path, lazy=True)
+
+    def test_load_file_obj_lazy(self):
+        with open(unifont_path, 'rb') as f:
+            font = Font().load_file_obj(f, lazy=True)
+        self.assertEqual(font.glyphs[97], self.font.glyphs[97])
+
+    def test_headers_props(self):
+        self.assertEqual(self.lazyfont.headers, self.font.headers)
+        self.assertEqual(self.lazyfont.props, self.font.props)
+
+    def test_parse_on_demand(self):
+        self.assertEqual(self.lazyfont.glyphs.parsed(), 0)
+        self.assertEqual(self.lazyfont.glyph('a').meta, glyph_a_meta)
+        self.assertEqual(self.lazyfont.glyphs.parsed(), 1)
+
+    def test_glyphs(self):
+        self.assertEqual(len(self.lazyfont), 849)
+        self.assertEqual(list(self.lazyfont.itercps(order=0)),
+                         list(self.font.itercps(order=0)))
+        self.assertEqual(list(self.lazyfont.itercps(order=-1)),
+                         list(self.font.itercps(order=-1)))
+        for cp in self.font.itercps():
+            self.assertEqual(self.lazyfont.glyphs[cp], self.font.glyphs[cp])
+
+    def test_draw(self):
+        self.assertEqual(self.lazyfont.draw('Bé H好Δi的').bindata,
+                         self.font.draw('Bé H好Δi的').bindata)
+
+    def test_prefetch(self):
+        font = Font(unifont_path, lazy=True, prefetch=True)
+        font.glyph('a')
+        for _ in range(100):
+            if font.glyphs.parsed() == 256:
+                break
+            time.sleep(0.05)
+        self.assertEqual(font.glyphs.parsed(), 256)
+
+    def test_prefetch_thread_ends(self):
+        threads = threading.active_count()
+        font = Font(unifont_path, lazy=True, prefetch=True)
+        for c in 'a\u0101':
+            font.glyph(c)
+            for _ in range(100):
+                if threading.active_count() == threads:
+                    break
+                time.sleep(0.05)
+            self.assertEqual(threading.active_count(), threads)
+        self.assertGreater(font.glyphs.parsed(), 256)
+
+    def test_prefetch_glyphs_changed(self):
+        font = Font(unifont_path, lazy=True, prefetch=True)
+        glyph_meta = list(self.font.glyphs[97])
+        font.glyph('a')
+        font.glyphs[98] = glyph_meta
+        del font.glyphs[99]
+        for _ in range(100):
+            if font.glyphs.parsed() == 255:
+                break
+            time.sleep(0.05)
+        time.sleep(0.05)
+        self.assertEqual(font.glyphs.parsed(), 255)
+        self.assertIs(font.glyphs[98], glyph_meta)
+        self.assertNotIn(99, font.glyphs)
+
+
+class TestFontBytesLoading(SameFontTestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+        with open(unifont_path, 'rb') as f:
+            self.data = f.read()
+
+    def test_bytes(self):
+        self.assertSameFont(Font(self.data), self.font)
+
+    def test_bytearray(self):
+        self.assertSameFont(Font(bytearray(self.data)), self.font)
+
+    def test_memoryview(self):
+        self.assertSameFont(Font(memoryview(self.data)), self.font)
+
+    def test_mmap(self):
+        with open(unifont_path, 'rb') as f:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.assertSameFont(Font(m), self.font)
+
+    def test_binary_file_obj(self):
+        self.assertSameFont(Font(io.BytesIO(self.data)), self.font)
+        with open(unifont_path, 'rb') as f:
+            self.assertSameFont(Font(f), self.font)
+
+    def test_engine_bytes(self):
+        self.assertSameFont(Font(unifont_path, engine='bytes'), self.font)
+
+    def test_unusual_layout(self):
+        # keywords out of the usual order, indented lines and CRLF line endings
+        with open(specfont_path, 'rb') as f:
+            data = f.read()
+        data = data.replace(b'BBX 4 6 2 12\n', b'')
+        data = data.replace(b'ENCODING 39\n', b'ENCODING 39\nBBX 4 6 2 12\n')
+        data = data.replace(b'DWIDTH 8 0\n', b'  DWIDTH 8 0\n')
+        reffont = Font(io.StringIO(data.decode()))
+        self.assertSameFont(Font(data), reffont)
+        self.assertSameFont(Font(data.replace(b'\n', b'\r\n')), reffont)
+        self.assertEqual(Font(data, lazy=True).glyphs[39], reffont.glyphs[39])
+
+    def test_bitmap_multi_token_lines(self):
+        # only lines of one token are bitmap rows, in both engines
+        with open(specfont_path, 'rb') as f:
+            data = f.read().replace(b'BITMAP\n', b'BITMAP\nCOMMENT hi\n\t7E 00\n')
+        reffont = Font(io.StringIO(data.decode()))
+        self.assertEqual(reffont.glyphs[39][16],
+                         Font(specfont_path).glyphs[39][16])
+        for kwargs in ({}, {'lazy': True}, {'workers': 2}):
+            font = Font(data, **kwargs)
+            for cp in (39, 106):
+                self.assertEqual(font.glyphs[cp], reffont.glyphs[cp])
+
+    def test_workers(self):
+        self.assertSameFont(Font(unifont_path, workers=2), self.font)
+        self.assertSameFont(
+            Font(unifont_path, workers=2, compact=True), self.font)
+
+    def test_workers_warnings(self):
+        with open(specfont_path, 'rb') as f:
+            data = f.read().replace(b'CHARS 2', b'CHARS 3').replace(b'ENDFONT', b'')
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            font = Font(data, workers=2)
+        self.assertEqual(len(font), 2)
+        self.assertEqual([str(m.message) for m in w], [
+            "This font does not have 'ENDFONT' keyword",
+            "The glyph count next to 'CHARS' keyword is 3, which does not match the actual glyph count 2"])
+
+
+class TestFontCompiled(SameFontTestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_save_load_compiled(self):
+        compiled_path = os.path.join(self.tempdir, 'unifont.bdfc')
+        self.assertIsInstance(self.font.save_compiled(compiled_path), Font)
+        font = Font().load_compiled(compiled_path)
+        self.assertSameFont(font, self.font)
+        self.assertEqual(font.declaredlength(), 849)
+        self.assertEqual(font.draw('Bé H好Δi的').bindata,
+                         self.font.draw('Bé H好Δi的').bindata)
+
+    def test_save_load_compiled_unusual_hexdata(self):
+        font = Font(specfont_path)
+        font.glyphs[106][16] = [h.lower() for h in font.glyphs[106][16]]
+        font.glyphs[39][16] = ['7', '70', 'e0']
+        compiled_path = os.path.join(self.tempdir, 'spec.bdfc')
+        font.save_compiled(compiled_path)
+        self.assertSameFont(Font().load_compiled(compiled_path), font)
+
+    def test_load_compiled_not_compiled(self):
+        with self.assertRaises(Exception):
+            Font().load_compiled(unifont_path)
+
+    def test_cache(self):
+        font_path = os.path.join(self.tempdir, 'spec.bdf')
+        shutil.copyfile(specfont_path, font_path)
+        self.assertSameFont(Font(font_path, cache=True), Font(specfont_path))
+        self.assertTrue(os.path.exists(font_path + '.bdfc'))
+        self.assertSameFont(Font(font_path, cache=True), Font(specfont_path))
+        self.assertEqual(Font(font_path, cache=True).declaredlength(), 2)
+
+        # touched but unchanged, then changed
+        os.utime(font_path, (0, 0))
+        self.assertSameFont(Font(font_path, cache=True), Font(specfont_path))
+        with open(font_path + '.bdfc', 'rb') as f:
+            f.seek(16)
+            self.assertEqual(struct.unpack('<q', f.read(8))[0],
+                             os.stat(font_path).st_mtime_ns)
+        with open(font_path, 'a') as f:
+            f.write('\n')
+        with open(font_path, 'r+') as f:
+            data = f.read().replace('ENCODING 39', 'ENCODING 40')
+            f.seek(0)
+            f.write(data)
+        self.assertIn(40, Font(font_path, cache=True).glyphs)
+
+    def test_cache_file_changed_while_loading(self):
+        font_path = os.path.join(self.tempdir, 'spec.bdf')
+        shutil.copyfile(specfont_path, font_path)
+
+        class ChangingFont(Font):
+            def load_file_obj(self, file_obj, **kwargs):
+                Font.load_file_obj(self, file_obj, **kwargs)
+                with open(font_path, 'r+') as f:
+                    data = f.read().replace('ENCODING 39', 'ENCODING 40')
+                    f.seek(0)
+                    f.write(data)
+
+        self.assertIn(39, ChangingFont(font_path, cache=True).glyphs)
+        self.assertIn(40, Font(font_path, cache=True).glyphs)
+
+    def test_cache_directory(self):
+        Font(specfont_path, cache=self.tempdir)
+        self.assertEqual(len(os.listdir(self.tempdir)), 1)
+        self.assertSameFont(Font(specfont_path, cache=self.tempdir),
+                            Font(specfont_path))
+
+
+@unittest.skipIf(sys.version_info < (3, 8), 'Shared memory needs Python 3.8+')
+class TestFontSharedMemory(SameFontTestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+        self.shm = self.font.publish()
+
+    def tearDown(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def test_attach(self):
+        font = Font.attach(self.shm.name)
+        self.assertSameFont(font, self.font)
+        self.assertEqual(font.declaredlength(), 849)
+        self.assertEqual(font.glyph('a').meta, self.font.glyph('a').meta)
+        self.assertEqual(font.draw('Bé H好Δi的').bindata,
+                         self.font.draw('Bé H好Δi的').bindata)
+
+    def test_import_on_first_use(self):
+        code = 'import sys, bdfparser; print("multiprocessing.shared_memory" in sys.modules)'
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        self.assertEqual(subprocess.check_output(
+            [sys.executable, '-c', code], env=env).split(), [b'False'])
+
+    def test_attach_other_process(self):
+        with ProcessPoolExecutor(1) as executor:
+            bindata = executor.submit(
+                _attached_draw, self.shm.name, 'Bé H好Δi的').result()
+        self.assertEqual(bindata, self.font.draw('Bé H好Δi的').bindata)
+        # the block survives the worker process
+        self.assertSameFont(Font.attach(self.shm.name), self.font)
+
+    def test_attach_read_only(self):
+        font = Font.attach(self.shm.name)
+        with self.assertRaises(TypeError):
+            font.glyphs.sections[1][0] = 0
+
+
+class TestFontPickle(SameFontTestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+
+    def test_pickle(self):
+        with open(unifont_path, 'r') as f:
+            font = Font(f)
+        data = pickle.dumps(font)
+        self.assertLess(len(data), len(pickle.dumps(dict(font.glyphs))))
+        font = pickle.loads(data)
+        self.assertSameFont(font, self.font)
+        self.assertEqual(font.declaredlength(), 849)
+        self.assertEqual(font.draw('Bé H好Δi的').bindata,
+                         self.font.draw('Bé H好Δi的').bindata)
+
+    def test_pickle_lazy_compact(self):
+        for font in (Font(unifont_path, lazy=True), Font(unifont_path, engine='bytes'),
+                     Font(unifont_path, compact=True)):
+            self.assertSameFont(pickle.loads(pickle.dumps(font)), self.font)
+        font = pickle.loads(pickle.dumps(Font(unifont_path, compact=True)))
+        font.glyphs[97][2] = 0
+        self.assertEqual(font.glyphs[97][2], 8)
+
+    def test_pickle_glyphs(self):
+        for glyphs in (pickle.loads(pickle.dumps(self.font.glyphs)), copy.deepcopy(self.font.glyphs)):
+            self.assertEqual(glyphs, self.font.glyphs)
+            glyphs[97] = glyphs[98]
+            self.assertEqual(glyphs[97], self.font.glyphs[98])
+
+    def test_pickle_dedupe_stats(self):
+        font = Font(unifont_path, dedupe=True)
+        self.assertEqual(pickle.loads(pickle.dumps(font)).dedupe_stats(),
+                         font.dedupe_stats())
+
+    def test_copy(self):
+        font = copy.copy(self.font)
+        self.assertIs(font.glyphs, self.font.glyphs)
+        self.assertIs(font.bitmapcache, self.font.bitmapcache)
+        font = copy.deepcopy(self.font)
+        self.assertIsNot(font.glyphs, self.font.glyphs)
+        self.assertSameFont(font, self.font)
+        font.glyphs[97][2] = 0
+        self.assertEqual(self.font.glyphs[97][2], 8)
+
+    def test_pickle_stack(self):
+        stack = FontStack([Font(specfont_path), self.font])
+        stack2 = pickle.loads(pickle.dumps(stack))
+        self.assertIsInstance(stack2, FontStack)
+        self.assertEqual(stack2.fontbycp(97).headers, self.font.headers)
+        self.assertEqual(stack2.draw('ja').bindata, stack.draw('ja').bindata)
+
+    def test_pickle_process_pool(self):
+        with ProcessPoolExecutor(1) as executor:
+            bindata = executor.submit(_draw, self.font, 'Bé H好Δi的').result()
+        self.assertEqual(bindata.bindata, self.font.draw('Bé H好Δi的').bindata)
+
+
+class TestFontCompressed(SameFontTestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+        self.tempdir = tempfile.mkdtemp()
+        with open(unifont_path, 'rb') as f:
+            data = f.read()
+        self.paths = []
+        for module, ext in ((gzip, '.gz'), (bz2, '.bz2'), (lzma, '.xz')):
+            # no extension: compression is detected by magic bytes
+            path = os.path.join(self.tempdir, 'unifont' + ext + '.bdf')
+            with module.open(path, 'wb') as f:
+                f.write(data)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_compressed(self):
+        for path in self.paths:
+            self.assertSameFont(Font(path), self.font)
+
+    def test_compressed_bytes(self):
+        for path in self.paths:
+            self.assertSameFont(Font(path, engine='bytes'), self.font)
+
+    def test_compressed_lazy(self):
+        for path in self.paths:
+            font = Font(path, lazy=True)
+            self.assertEqual(font.glyph('a').meta, glyph_a_meta)
+            self.assertSameFont(font, self.font)
+
+    def test_compressed_iterparse(self):
+        it = iterparse(self.paths[0])
+        self.assertEqual(next(it).headers, self.font.headers)
+        self.assertEqual(list(it), list(self.font.glyphs.values()))
+
+    def test_compressed_cache(self):
+        self.assertSameFont(Font(self.paths[0], cache=True), self.font)
+        self.assertSameFont(Font(self.paths[0], cache=True), self.font)
+
+
+class TestFontCompact(SameFontTestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+
+    def test_compact(self):
+        for kwargs in ({}, {'engine': 'bytes'}, {'workers': 2}):
+            font = Font(unifont_path, compact=True, **kwargs)
+            self.assertSameFont(font, self.font)
+            self.assertEqual(font.glyphs.parsed(), 0)
+
+    def test_compact_method(self):
+        font = Font(unifont_path).compact()
+        self.assertSameFont(font, self.font)
+        self.assertEqual(font.glyph('a').meta, glyph_a_meta)
+        self.assertEqual(font.draw('Bé H好Δi的').bindata,
+                         self.font.draw('Bé H好Δi的').bindata)
+
+    def test_compact_assign(self):
+        font = Font(specfont_path, compact=True)
+        glyph_meta = font.glyphs[39]
+        glyph_meta[16] = ['FF']
+        self.assertNotEqual(font.glyphs[39][16], ['FF'])
+        font.glyphs[39] = glyph_meta
+        self.assertEqual(font.glyphs[39][16], ['FF'])
+        del font.glyphs[39]
+        self.assertNotIn(39, font.glyphs)
+        self.assertEqual(len(font), 1)
+
+
+class TestFontDedupe(SameFontTestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+
+    def test_dedupe(self):
+        for kwargs in ({}, {'engine': 'bytes'}, {'workers': 2}):
+            font = Font(unifont_path, dedupe=True, **kwargs)
+            self.assertSameFont(font, self.font)
+            stats = font.dedupe_stats()
+            self.assertEqual(stats['bitmaps'], 849)
+            self.assertEqual(stats['unique_bitmaps'], len(
+                set(tuple(meta[16]) for meta in font.glyphs.values())))
+            self.assertLess(stats['unique_rows'], stats['rows'])
+            self.assertGreater(stats['savedbytes'], 0)
+        self.assertIsNone(self.font.dedupe_stats())
+        self.assertIsNone(Font(unifont_path, lazy=True,
+                               dedupe=True).dedupe_stats())
+
+    def test_dedupe_shared(self):
+        font = Font(unifont_path, dedupe=True)
+        bitmaps = {}
+        rows = {}
+        for glyph_meta in font.glyphs.values():
+            hexdata = glyph_meta[16]
+            self.assertIs(bitmaps.setdefault(tuple(hexdata), hexdata), hexdata)
+            for row in hexdata:
+                self.assertIs(rows.setdefault(row, row), row)
+
+
+class TestFontBitmapCache(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+        self.reffont = Font(unifont_path)
+        self.reffont.bitmapcache = None
+
+    def test_cached_draw(self):
+        for _ in range(2):
+            self.assertEqual(self.font.draw('Bé H好Δi的').bindata,
+                             self.reffont.draw('Bé H好Δi的').bindata)
+        # missing glyphs are not cached
+        n = len([c for c in 'Bé H好Δi的' if ord(c) in self.font.glyphs])
+        stats = self.font.bitmapcache.stats()
+        self.assertEqual(stats['misses'], n)
+        self.assertEqual(stats['hits'], n)
+        self.assertEqual(stats['size'], n)
+
+    def test_modes(self):
+        glyph = self.font.glyph('a')
+        for mode, bb in ((0, None), (1, None), (2, None), (-1, (4, 4, 1, 1))):
+            self.assertEqual(glyph.draw(mode, bb).bindata,
+                             self.reffont.glyph('a').draw(mode, bb).bindata)
+            self.assertEqual(glyph.draw(mode, bb).bindata,
+                             self.reffont.glyph('a').draw(mode, bb).bindata)
+        self.assertEqual(self.font.bitmapcache.stats()['hits'], 4)
+
+    def test_copies(self):
+        bitmap = self.font.glyph('a').draw()
+        bitmap.bindata[0] = '1' * 16
+        bitmap.glow()
+        self.assertEqual(self.font.glyph('a').draw().bindata,
+                         self.reffont.glyph('a').draw().bindata)
+
+    def test_changed_glyph(self):
+        self.font.glyph('a').draw()
+        self.font.glyphs[97][16] = ['FF'] * 16
+        self.assertEqual(self.font.glyph('a').draw(1).bindata, ['11111111'] * 16)
+        self.font.headers['fbbx'] = 10
+        self.assertEqual(self.font.glyph('a').draw().width(), 10)
+
+    def test_unencoded(self):
+        font = Font(specfont_path)
+        glyph_metas = [[glyph_meta[0], -1] + glyph_meta[2:]
+                       for glyph_meta in font.glyphs.values()]
+        for _ in range(2):
+            for glyph_meta in glyph_metas:
+                self.assertEqual(Glyph.fromlist(glyph_meta, font).draw().bindata,
+                                 font.glyphbyname(glyph_meta[0]).draw().bindata)
+        stats = font.bitmapcache.stats()
+        self.assertEqual(stats['size'], 4)
+        self.assertEqual(stats['hits'], 4)
+
+    def test_lru(self):
+        self.font.bitmapcache = BitmapCache(maxsize=2)
+        for c in 'abca':
+            self.font.glyph(c).draw()
+        stats = self.font.bitmapcache.stats()
+        self.assertEqual(stats['evictions'], 2)
+        self.assertEqual(stats['hits'], 0)
+        self.font.glyph('c').draw()
+        self.assertEqual(self.font.bitmapcache.stats()['hits'], 1)
+
+    def test_threads(self):
+        self.font.bitmapcache = BitmapCache(maxsize=1)
+        text = 'ab' * 300
+
+        def draw(i):
+            return [self.font.glyph(c).draw().bindata for c in text[i:]]
+        expected = [self.reffont.glyph(c).draw().bindata for c in text]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switch threads often
+        try:
+            with ThreadPoolExecutor(8) as executor:
+                for i, result in enumerate(executor.map(draw, range(8))):
+                    self.assertEqual(result, expected[i:])
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(len(self.font.bitmapcache), 1)
+
+    def test_copy(self):
+        cache = copy.deepcopy(self.font.bitmapcache)
+        self.assertIsInstance(cache, BitmapCache)
+        self.assertEqual(cache.stats(), self.font.bitmapcache.stats())
+
+    def test_maxpixels(self):
+        self.font.bitmapcache = BitmapCache(maxpixels=16 * 16 * 2)
+        for c in 'abc':
+            self.font.glyph(c).draw()
+        self.assertEqual(len(self.font.bitmapcache), 2)
+        self.assertEqual(self.font.bitmapcache.stats()['pixels'], 16 * 16 * 2)
+
+    def test_invalidate(self):
+        for c in 'ab':
+            self.font.glyph(c).draw()
+        self.font.bitmapcache.invalidate(97)
+        self.assertEqual(len(self.font.bitmapcache), 1)
+        self.font.bitmapcache.invalidate()
+        self.assertEqual(len(self.font.bitmapcache), 0)
+        self.assertEqual(self.font.bitmapcache.stats()['pixels'], 0)
+
+
+class TestFontFilteredLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+        self.only = [(0x41, 0x5A), (0x4E00, 0x9FFF)]
+        self.cps = list(self.font.itercps(order=0, r=self.only))
+
+    def assertFiltered(self, **kwargs):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            font = Font(unifont_path, only=self.only, **kwargs)
+        self.assertEqual(list(font.glyphs.keys()), self.cps)
+        for cp in self.cps:
+            self.assertEqual(font.glyphs[cp], self.font.glyphs[cp])
+        self.assertEqual(font.headers, self.font.headers)
+        self.assertEqual(font.props, self.font.props)
+
+    def test_only(self):
+        self.assertFiltered()
+
+    def test_only_bytes(self):
+        self.assertFiltered(engine='bytes')
+
+    def test_only_lazy(self):
+        self.assertFiltered(lazy=True)
+
+    def test_only_workers(self):
+        self.assertFiltered(workers=2)
+
+    def test_only_no_encoding(self):
+        with open(specfont_path, 'rb') as f:
+            data = f.read().replace(b'ENCODING 39\n', b'')
+        for kwargs in ({}, {'lazy': True}, {'workers': 2}):
+            for font in (Font(data, only=(0, 200), **kwargs),
+                         Font(io.StringIO(data.decode()), only=(0, 200), **kwargs)):
+                self.assertEqual(list(font.glyphs.keys()), [106])
+                self.assertEqual(font.unencoded, [])
+        it = iterparse(io.StringIO(data.decode()), only=(0, 200))
+        next(it)
+        self.assertEqual([glyph_meta[1] for glyph_meta in it], [106])
+
+    def test_only_int(self):
+        font = Font(unifont_path, only=128)
+        self.assertEqual(list(font.glyphs.keys()),
+                         list(self.font.itercps(order=0, r=128)))
+        self.assertEqual(font.glyph('a').meta, glyph_a_meta)
+
+
+class TestFontIterparse(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+
+    def test_iterparse(self):
+        it = iterparse(unifont_path)
+        font = next(it)
+        self.assertIsInstance(font, Font)
+        self.assertEqual(font.headers, self.font.headers)
+        self.assertEqual(font.props, self.font.props)
+        self.assertEqual(len(font.glyphs), 0)
+        self.assertEqual(list(it), list(self.font.glyphs.values()))
+        self.assertEqual(len(font.glyphs), 0)
+
+    def test_iterparse_glyph(self):
+        it = iterparse(unifont_path, glyph=True)
+        next(it)
+        for glyph in it:
+            if glyph.cp() == 97:
+                self.assertEqual(glyph.meta, glyph_a_meta)
+                self.assertEqual(glyph.draw(1).bindata,
+                                 self.font.glyph('a').draw(1).bindata)
+
+    def test_iterparse_file_obj(self):
+        with open(unifont_path, 'rb') as f:
+            it = iterparse(f)
+            self.assertEqual(next(it).headers, self.font.headers)
+            self.assertEqual(len(list(it)), len(self.font))
+            self.assertFalse(f.closed)
+
+    def test_iterparse_font_method(self):
+        font = Font()
+        it = font.iterparse(unifont_path, only=(0x41, 0x5A))
+        self.assertEqual(font.headers, self.font.headers)
+        self.assertEqual([glyph_meta[1] for glyph_meta in it],
+                         list(range(0x41, 0x5B)))
+
+    def test_iterparse_not_iterated(self):
+        font = Font()
+        font.iterparse(unifont_path)
+        font.load_file_path(unifont_path)
+        self.assertEqual(len(font), len(self.font))
+
+    def test_iterparse_warnings(self):
+        with open(specfont_path) as f:
+            data = f.read().replace('CHARS 2', 'CHARS 3')
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            self.assertEqual(len(list(iterparse(io.StringIO(data)))), 3)
+        self.assertEqual([str(m.message) for m in w], [
+            "The glyph count next to 'CHARS' keyword is 3, which does not match the actual glyph count 2"])
+
+
+class TestFontParser(SameFontTestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+        with open(unifont_path, 'rb') as f:
+            self.data = f.read()
+
+    def test_feed(self):
+        for size in (1, 100, 4096):
+            parser = FontParser()
+            glyph_metas = []
+            for i in range(0, len(self.data), size):
+                glyph_metas.extend(parser.feed(self.data[i:i + size]))
+            self.assertSameFont(parser.close(), self.font)
+            self.assertEqual(glyph_metas, list(self.font.glyphs.values()))
+
+    def test_feed_emits_early(self):
+        parser = FontParser()
+        half = len(self.data) // 2
+        glyph_metas = parser.feed(self.data[:half])
+        self.assertEqual(parser.font.headers, self.font.headers)
+        self.assertTrue(0 < len(glyph_metas) < len(self.font))
+
+    def test_feed_str(self):
+        parser = FontParser()
+        with open(specfont_path) as f:
+            for line in f:
+                parser.feed(line)
+        self.assertSameFont(parser.close(), Font(specfont_path))
+
+    def test_close_warnings(self):
+        with open(specfont_path, 'rb') as f:
+            data = f.read().replace(b'CHARS 2', b'CHARS 3').replace(
+                b'ENDFONT', b'').rstrip()
+        parser = FontParser()
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            parser.feed(data)
+            self.assertEqual(len(parser.close()), 2)
+        self.assertEqual([str(m.message) for m in w], [
+            "This font does not have 'ENDFONT' keyword",
+            "The glyph count next to 'CHARS' keyword is 3, which does not match the actual glyph count 2"])
+
+    def test_feed_after_close(self):
+        parser = FontParser()
+        parser.feed(self.data)
+        parser.close()
+        with self.assertRaises(Exception):
+            parser.feed(self.data)
+
+
+class TestFontProbe(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+
+    def test_probe(self):
+        info = probe(unifont_path)
+        self.assertIsInstance(info, FontInfo)
+        self.assertEqual(info.headers, self.font.headers)
+        self.assertEqual(info.props, self.font.props)
+        self.assertEqual(info.chars, 849)
+        self.assertIsNone(info.codepoints)
+
+    def test_probe_codepoints(self):
+        info = probe(unifont_path, codepoints=True)
+        self.assertEqual(info.codepoints, list(self.font.glyphs.keys()))
+
+    def test_declaredlength(self):
+        self.assertEqual(self.font.declaredlength(), 849)
+        self.assertIsNone(Font().declaredlength())
+
+
+class TestFontAsync(SameFontTestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_aload(self):
+        font = self.loop.run_until_complete(Font.aload(unifont_path))
+        self.assertSameFont(font, self.font)
+
+    def test_aload_file_obj(self):
+        with open(specfont_path, 'rb') as f:
+            font = self.loop.run_until_complete(Font.aload(f, chunksize=16))
+            self.assertFalse(f.closed)
+        self.assertSameFont(font, Font(specfont_path))
+
+    def test_aload_many(self):
+        fonts = self.loop.run_until_complete(
+            aload_many([unifont_path, specfont_path]))
+        self.assertSameFont(fonts[0], self.font)
+        self.assertSameFont(fonts[1], Font(specfont_path))
+
+    def test_asyncio_import_on_first_use(self):
+        code = 'import sys, bdfparser; print("asyncio" in sys.modules)'
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        self.assertEqual(subprocess.check_output(
+            [sys.executable, '-c', code], env=env).split(), [b'False'])
+
+    def test_aload_cancel(self):
+        task = self.loop.create_task(Font.aload(unifont_path, chunksize=64))
+        self.loop.call_later(0.01, task.cancel)
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(task)
+
+
 class TestFont(unittest.TestCase):
 
     def setUp(self):
@@ -157,6 +938,21 @@ class TestFontIter(unittest.TestCase):
         self.assertEqual(r_letters_with_nonexistent_range, [65, 66, 67, 68, 69, 70, 71, 72, 73, 74, 75, 76, 77, 78, 79, 80, 81, 82, 83, 84, 85, 86, 87, 88, 89, 90,
                                                             97, 98, 99, 100, 101, 102, 103, 104, 105, 106, 107, 108, 109, 110, 111, 112, 113, 114, 115, 116, 117, 118, 119, 120, 121, 122])
 
+    def test_itercps_overlapping_ranges(self):
+        self.assertEqual(list(self.font.itercps(r=[(70, 90), (65, 75), (72, 80)])),
+                         list(range(65, 91)))
+        self.assertEqual(list(self.font.itercps(r=(90, 65))), [])
+        self.assertEqual(list(self.font.itercps(r='a')), [])
+
+    def test_itercps_glyphs_changed(self):
+        self.assertEqual(next(self.font.itercps(order=2)), 30340)
+        self.font.glyphs[0x10000] = self.font.glyphs[97]
+        self.assertEqual(next(self.font.itercps(order=2)), 0x10000)
+        del self.font.glyphs[0x10000]
+        self.assertEqual(next(self.font.itercps(order=2)), 30340)
+        self.font.glyphs = {98: self.font.glyphs[98], 97: self.font.glyphs[97]}
+        self.assertEqual(list(self.font.itercps()), [97, 98])
+
     def test_iterglyphs_list_len(self):
         self.assertEqual(len(list(self.font.iterglyphs())), len(self.font))
 
@@ -191,6 +987,157 @@ class TestFontGetGlyph(unittest.TestCase):
         self.assertEqual(self.font.lacksglyphs('Bé Hi的'), None)
 
 
+class TestFontCoverage(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+
+    def test_covers(self):
+        self.assertTrue(self.font.covers('Bé Hi的'))
+        self.assertFalse(self.font.covers('Bé H好Δi的'))
+        self.assertTrue(self.font.covers(''))
+
+    def test_covers_glyphs_changed(self):
+        self.font.glyphs[ord('好')] = self.font.glyphs[97]
+        self.assertTrue(self.font.covers('好'))
+        del self.font.glyphs[97]
+        self.assertFalse(self.font.covers('a'))
+        self.assertEqual(self.font.lacksglyphs('a好'), ['a'])
+
+    def test_coverage(self):
+        report = self.font.coverage(['Bé H好Δi的', '好好', 'Hi'])
+        self.assertEqual(report['chars'], 12)
+        self.assertEqual(report['missing'], 4)
+        self.assertEqual(list(report['missingchars'].items()),
+                         [('好', 3), ('Δ', 1)])
+        self.assertEqual(list(report['blocks'].items()), [
+            ('CJK Unified Ideographs', 3), ('Greek and Coptic', 1)])
+
+    def test_coverage_file_obj(self):
+        report = self.font.coverage(
+            [io.StringIO('Bé H好Δi的\r\n好好\n'), 'Hi'])
+        self.assertEqual(report['chars'], 12)
+        self.assertEqual(report['missing'], 4)
+        report = self.font.coverage(
+            [io.StringIO('Bé H好Δi的\r\n好好\r', newline=''), 'H\r\ni\n'])
+        self.assertEqual(report['chars'], 12)
+        self.assertEqual(report['missing'], 4)
+        self.assertEqual(self.font.coverage('好\n好\r\n')['chars'], 2)
+        self.assertEqual(self.font.coverage('\U0010FFFF')['blocks'],
+                         {'Supplementary Private Use Area-B': 1})
+        self.assertEqual(self.font.coverage('\u0870')['blocks'],
+                         {'Arabic Extended-B': 1})
+
+
+class TestFontGlyphNames(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        with open(specfont_path, 'rb') as f:
+            data = f.read()
+        # the two glyphs unencoded, then encoded twice
+        self.data = data.replace(b'CHARS 2', b'CHARS 4').replace(b'ENDFONT', b'') + \
+            data[data.index(b'STARTCHAR'):].replace(
+                b'ENCODING 39', b'ENCODING -1 5').replace(b'ENCODING 106', b'ENCODING -1')
+        self.reffont = Font(specfont_path)
+
+    def test_glyphbyname(self):
+        font = Font(unifont_path)
+        self.assertEqual(font.glyphbyname('U+0061').meta, glyph_a_meta)
+        self.assertIsNone(font.glyphbyname('nonexistent'))
+
+    def test_unencoded(self):
+        for kwargs in ({}, {'engine': 'text'}, {'lazy': True}, {'compact': True}, {'workers': 2},
+                       {'workers': 2, 'compact': True}):
+            if kwargs.get('engine') == 'text':
+                font = Font(io.StringIO(self.data.decode('utf-8')))
+            else:
+                font = Font(self.data, **kwargs)
+            self.assertEqual(sorted(font.glyphs), [39, 106])
+            self.assertEqual([glyph_meta[1] for glyph_meta in font.unencoded], [-1, -1])
+            self.assertEqual(font.glyphbyname('quoteright').cp(), 39)
+            self.assertEqual(font.glyphbyname('j').draw().bindata,
+                             self.reffont.glyph('j').draw().bindata)
+
+    def test_duplicate_encoding(self):
+        data = self.data.replace(b'ENCODING -1 5', b'ENCODING 39')
+        for kwargs in ({}, {'lazy': True}, {'compact': True}):
+            font = Font(data, **kwargs)
+            self.assertEqual(len(font.glyphs), 2)
+            self.assertEqual([glyph_meta[1] for glyph_meta in font.unencoded], [-1, 39])
+
+    def test_glyphbyname_glyphs_changed(self):
+        for kwargs in ({}, {'lazy': True}, {'compact': True}):
+            font = Font(self.data, **kwargs)
+            self.assertEqual(font.glyphbyname('quoteright').cp(), 39)
+            glyph_meta = list(font.glyphs[39])
+            glyph_meta[0] = 'renamed'
+            font.glyphs[39] = glyph_meta
+            self.assertEqual(font.glyphbyname('renamed').cp(), 39)
+            font.unencoded.append(['added', -1] + glyph_meta[2:])
+            self.assertEqual(font.glyphbyname('added').cp(), -1)
+
+    def test_compiled(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            compiled_path = os.path.join(tempdir, 'font.bdfc')
+            font = Font(self.data)
+            font.save_compiled(compiled_path)
+            compiled = Font().load_compiled(compiled_path)
+            self.assertEqual(compiled.unencoded, font.unencoded)
+            self.assertEqual(compiled.glyphbyname('j').cp(), 106)
+        finally:
+            shutil.rmtree(tempdir)
+
+
+class TestFontStack(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.specfont = Font(specfont_path)
+        self.unifont = Font(unifont_path)
+        self.stack = FontStack([self.specfont, self.unifont])
+
+    def test_glyphs(self):
+        self.assertEqual(len(self.stack), len(self.unifont))
+        self.assertIs(self.stack.fontbycp(ord('j')), self.specfont)
+        self.assertIs(self.stack.fontbycp(ord('a')), self.unifont)
+        self.assertIsNone(self.stack.fontbycp(ord('好')))
+        self.assertEqual(self.stack.glyph('j').meta['glyphname'], 'j')
+        self.assertEqual(self.stack.glyph('a').meta, glyph_a_meta)
+        self.assertEqual(self.stack.lacksglyphs('aj好'), ['好'])
+        self.assertTrue(self.stack.covers('aj的'))
+
+    def test_fbb(self):
+        # union of (9, 24, -2, -6) and (16, 16, 0, -2)
+        h = self.stack.headers
+        self.assertEqual((h['fbbx'], h['fbby'], h['fbbxoff'], h['fbbyoff']),
+                         (18, 24, -2, -6))
+        self.assertEqual(self.specfont.headers['fbbx'], 9)
+
+    def test_draw_baseline(self):
+        fbb = (18, 24, -2, -6)
+        self.assertEqual(self.stack.draw('a').bindata,
+                         self.unifont.glyph('a').draw(-1, fbb).bindata)
+        self.assertEqual(self.stack.draw('j').bindata,
+                         self.specfont.glyph('j').draw(-1, fbb).bindata)
+        # 'a' ends on the baseline, 6 rows above the bottom, as 'j' does before its descender
+        bitmap = self.stack.draw('aj')
+        self.assertEqual(bitmap.height(), 24)
+        rows = [i for i, row in enumerate(bitmap.bindata) if '1' in row[:8]]
+        self.assertEqual(rows[-1], 24 - 6 - 1)
+
+    def test_draw_same_fbb(self):
+        stack = FontStack([Font(unifont_path), self.unifont])
+        self.assertEqual(stack.draw('Bé Hi的').bindata,
+                         self.unifont.draw('Bé Hi的').bindata)
+
+    def test_empty(self):
+        with self.assertRaises(Exception):
+            FontStack([])
+
+
 class TestFontDraw(unittest.TestCase):
 
     def setUp(self):
@@ -1,3 +1,4 @@
+import pickle
 import unittest
 from bdfparser import Font, Glyph
 from .info import unifont_path, glyph_a_meta, bitmap_a_bindata, specfont_path
@@ -29,6 +30,57 @@ class TestGlyph(unittest.TestCase):
         self.assertEqual(self.glyph_a.chr(), 'a')
 
 
+class TestGlyphView(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.font = Font(unifont_path)
+        self.glyph_a = Glyph.fromlist(self.font.glyphs[97], self.font)
+
+    def test_fromlist(self):
+        self.assertIsInstance(self.glyph_a, Glyph)
+        self.assertEqual(self.glyph_a.cp(), 97)
+        self.assertEqual(self.glyph_a.draw().bindata, bitmap_a_bindata)
+        self.assertEqual(self.glyph_a.meta, glyph_a_meta)
+
+    def test_getmeta(self):
+        self.assertEqual(self.glyph_a.getmeta('dwx0'), 8)
+        self.assertIsNone(self.glyph_a.getmeta('dwx1'))
+        self.assertIsNone(self.glyph_a.getmeta('nonexistent'))
+        self.assertEqual(Glyph(glyph_a_meta, self.font).getmeta('bbh'), 16)
+
+    def test_meta_assign(self):
+        self.glyph_a.meta['codepoint'] = 98
+        self.assertEqual(self.glyph_a.cp(), 98)
+        self.glyph_a.meta = dict(glyph_a_meta)
+        self.assertEqual(self.glyph_a.cp(), 97)
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            self.glyph_a.foo = 1
+
+    def test_draw_tobuffer(self):
+        self.assertEqual(self.glyph_a.draw(2).tobuffer(),
+                         bytes.fromhex(''.join(glyph_a_meta['hexdata'])))
+
+    def test_pickle(self):
+        glyph = pickle.loads(pickle.dumps(self.glyph_a))
+        self.assertEqual(glyph.meta, glyph_a_meta)
+        self.assertEqual(glyph.draw().bindata, bitmap_a_bindata)
+        glyph = pickle.loads(pickle.dumps(Glyph(glyph_a_meta, self.font)))
+        self.assertEqual(glyph.meta, glyph_a_meta)
+        self.assertEqual(glyph.draw().bindata, bitmap_a_bindata)
+        self.assertEqual(glyph.origin(), self.glyph_a.origin())
+
+    def test_pickle_without_font(self):
+        data = pickle.dumps(self.glyph_a)
+        self.assertLess(len(data), 1024)
+        glyph = pickle.loads(data)
+        self.assertEqual(len(glyph.font), 0)
+        self.assertEqual(glyph.font.headers['fontname'],
+                         self.font.headers['fontname'])
+
+
 class TestGlyphDraw(unittest.TestCase):
 
     def setUp(self):